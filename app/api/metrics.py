@@ -0,0 +1,67 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from auth.user_cache import user_cache
+from database import get_pool_stats
+from events import event_hub
+from metrics import Gauge, registry
+from project_cache import project_cache
+from security import verified_tokens
+
+router = APIRouter()
+
+DB_POOL = registry.register(Gauge(
+    "db_pool", "Database pool statistics (see GET /metrics/db-pool).",
+    ("stat",),
+))
+USER_CACHE = registry.register(Gauge(
+    "user_cache", "Authenticated-user cache counters.", ("stat",),
+))
+TOKEN_CACHE = registry.register(Gauge(
+    "verified_token_cache", "Verified-JWT cache counters.", ("stat",),
+))
+PROJECT_CACHE = registry.register(Gauge(
+    "project_cache", "Project read-through cache counters and hit ratio.",
+    ("stat",),
+))
+TASK_EVENTS = registry.register(Gauge(
+    "task_events", "Live task event subscribers and fan-out counters.",
+    ("stat",),
+))
+
+
+def _collect_gauges() -> None:
+    for stat, value in get_pool_stats().items():
+        if isinstance(value, (int, float)):
+            DB_POOL.set(value, stat=stat)
+    for stat, value in user_cache.stats().items():
+        USER_CACHE.set(value, stat=stat)
+    for stat, value in verified_tokens.stats().items():
+        TOKEN_CACHE.set(value, stat=stat)
+    for stat, value in project_cache.stats().items():
+        PROJECT_CACHE.set(value, stat=stat)
+    for stat, value in event_hub.stats().items():
+        TASK_EVENTS.set(value, stat=stat)
+
+
+registry.add_collector(_collect_gauges)
+
+
+@router.get("", response_class=PlainTextResponse, summary="Prometheus metrics")
+async def prometheus_metrics():
+    """
+    Request, query, pool and cache metrics of this worker in the
+    Prometheus text exposition format.
+    """
+    return PlainTextResponse(
+        registry.render(), media_type="text/plain; version=0.0.4"
+    )
+
+
+@router.get("/db-pool", summary="Database connection pool statistics")
+async def db_pool_metrics():
+    """
+    Checkout counts, wait times, in-use and overflow connections of the
+    database pool in this worker.
+    """
+    return get_pool_stats()
@@ -1,15 +1,60 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
+import uuid
+from typing import List, Literal, Optional
+from fastapi import (
+    APIRouter, Depends, HTTPException, Query, Request, Response, status,
+)
+from fastapi.responses import JSONResponse, StreamingResponse
+from redis.exceptions import RedisError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from sqlalchemy.future import select
 
 from database import get_session
-from models import Project, User
-from schemas import ProjectCreate, ProjectRead
+from exports import export_response
+from etag import is_not_modified, not_modified, weak_etag
+from events import event_hub
+from project_cache import pack, project_cache, unpack
+from models import Project, Task
+from schemas import (
+    AssigneeSummary, ProjectBoard, ProjectCreate, ProjectRead, ProjectStats,
+    TaskRead,
+)
+from task_stats import project_stats
+from project_deletion import (
+    count_tasks, delete_project_rows, job_owner, remember_job_owner,
+)
+from redis_client import get_redis
+from responses import dumps, rows_to_dicts
+from config import get_settings
 from auth.deps import get_current_user
+from auth.user_cache import CurrentUser
 
 router = APIRouter()
 
+settings = get_settings()
+
+DEFAULT_BOARD_PAGE_SIZE = 50
+MAX_BOARD_PAGE_SIZE = 200
+
+# Columns of ProjectRead, selected as plain rows for the list endpoint.
+PROJECT_READ_COLUMNS = (
+    Project.id,
+    Project.name,
+    Project.description,
+    Project.owner_id,
+)
+
+
+def _cached_response(request: Request, value: str) -> Response:
+    """Answer from a packed cache value: 304 if the client is current."""
+    etag, body = unpack(value)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    return Response(
+        content=body, media_type="application/json", headers={"ETag": etag}
+    )
+
 
 @router.post(
     "/",
@@ -20,7 +65,7 @@ router = APIRouter()
 async def create_project(
     project_in: ProjectCreate,
     session: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     """
     Create a new project owned by the current user.
@@ -33,6 +78,7 @@ async def create_project(
     session.add(project)
     await session.commit()
     await session.refresh(project)
+    await project_cache.invalidate(current_user.id)
     return project
 
 
@@ -42,17 +88,51 @@ async def create_project(
     summary="Get all projects of current user",
 )
 async def get_projects(
+    request: Request,
     session: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     """
     Retrieve all projects owned by the current authenticated user.
+    Supports conditional requests through a weak ETag.
     """
-    result = await session.execute(
-        select(Project).where(Project.owner_id == current_user.id)
+    async def load() -> str:
+        result = await session.execute(
+            select(*PROJECT_READ_COLUMNS, Project.version)
+            .where(Project.owner_id == current_user.id)
+            .order_by(Project.id)
+        )
+        projects = rows_to_dicts(result.mappings())
+        etag = weak_etag(
+            "projects",
+            current_user.id,
+            [(project["id"], project.pop("version")) for project in projects],
+        )
+        return pack(etag, dumps(projects).decode())
+
+    value = await project_cache.get_or_load(
+        project_cache.list_key(current_user.id), load
     )
-    projects = result.scalars().all()
-    return projects
+    return _cached_response(request, value)
+
+
+@router.get(
+    "/export",
+    summary="Export all projects of current user",
+)
+async def export_projects(
+    fmt: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """
+    Stream every project owned by the current user as NDJSON or CSV.
+    """
+    query = (
+        select(*Project.__table__.columns)
+        .where(Project.owner_id == current_user.id)
+        .order_by(Project.id)
+    )
+    return export_response(query, fmt, "projects")
 
 
 @router.get(
@@ -62,16 +142,89 @@ async def get_projects(
 )
 async def get_project(
     project_id: int,
+    request: Request,
     session: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     """
     Retrieve a single project by ID, if owned by current user.
+    Supports conditional requests through a weak ETag.
+    """
+    async def load():
+        result = await session.execute(
+            select(Project).where(
+                Project.id == project_id,
+                Project.owner_id == current_user.id
+            )
+        )
+        project = result.scalars().first()
+        if not project:
+            return None
+        etag = weak_etag("project", project.id, project.version)
+        return pack(etag, ProjectRead.model_validate(project).model_dump_json())
+
+    value = await project_cache.get_or_load(
+        project_cache.item_key(current_user.id, project_id), load
+    )
+    if value is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found",
+        )
+    return _cached_response(request, value)
+
+
+@router.get(
+    "/{project_id}/stats",
+    response_model=ProjectStats,
+    summary="Get task counts of a project",
+)
+async def get_project_stats(
+    project_id: int,
+    session: AsyncSession = Depends(get_session),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """
+    Task counts by status and priority, read from the incrementally
+    maintained counters rather than aggregated over tasks.
+    """
+    result = await session.execute(
+        select(Project.id).where(
+            Project.id == project_id,
+            Project.owner_id == current_user.id,
+        )
+    )
+    if result.scalars().first() is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found",
+        )
+    return await project_stats(session, project_id)
+
+
+@router.get(
+    "/{project_id}/board",
+    response_model=ProjectBoard,
+    summary="Get a project with a page of its tasks and their assignees",
+)
+async def get_project_board(
+    project_id: int,
+    after_id: Optional[int] = Query(
+        None, description="Cursor: return tasks with an id greater than this"
+    ),
+    limit: int = Query(DEFAULT_BOARD_PAGE_SIZE, ge=1, le=MAX_BOARD_PAGE_SIZE),
+    session: AsyncSession = Depends(get_session),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """
+    Everything a project board needs in one call and three queries,
+    however many tasks the page holds: the project, the page of tasks, and
+    their assignees loaded with a single ``selectinload`` IN query.
     """
     result = await session.execute(
         select(Project).where(
             Project.id == project_id,
-            Project.owner_id == current_user.id
+            Project.owner_id == current_user.id,
         )
     )
     project = result.scalars().first()
@@ -80,7 +233,73 @@ async def get_project(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project not found",
         )
-    return project
+
+    query = (
+        select(Task)
+        .where(Task.project_id == project_id)
+        .options(selectinload(Task.assignee))
+        .order_by(Task.id)
+        # Fetch one extra row to know whether another page exists.
+        .limit(limit + 1)
+    )
+    if after_id is not None:
+        query = query.where(Task.id > after_id)
+    result = await session.execute(query)
+    tasks = result.scalars().all()
+
+    next_cursor = None
+    if len(tasks) > limit:
+        tasks = tasks[:limit]
+        next_cursor = tasks[-1].id
+
+    assignees = {
+        task.assignee.id: task.assignee
+        for task in tasks if task.assignee is not None
+    }
+    return ProjectBoard(
+        project=ProjectRead.model_validate(project),
+        tasks=[TaskRead.model_validate(task) for task in tasks],
+        assignees=[
+            AssigneeSummary.model_validate(user)
+            for _, user in sorted(assignees.items())
+        ],
+        next_cursor=next_cursor,
+    )
+
+
+@router.get(
+    "/{project_id}/events",
+    summary="Stream task changes of a project (Server-Sent Events)",
+)
+async def project_events(
+    project_id: int,
+    request: Request,
+    session: AsyncSession = Depends(get_session),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """
+    Push task created/updated/deleted events of the project as they are
+    committed, instead of polling the task endpoints. A ``resync`` event
+    means events were dropped and the task list should be refetched.
+    """
+    result = await session.execute(
+        select(Project.id).where(
+            Project.id == project_id,
+            Project.owner_id == current_user.id,
+        )
+    )
+    if result.scalars().first() is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found",
+        )
+    # Give the connection back now; the stream may stay open for hours.
+    await session.close()
+    return StreamingResponse(
+        event_hub.stream(project_id, request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.put(
@@ -92,7 +311,7 @@ async def update_project(
     project_id: int,
     project_in: ProjectCreate,
     session: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     """
     Update a project owned by the current user.
@@ -115,9 +334,62 @@ async def update_project(
     session.add(project)
     await session.commit()
     await session.refresh(project)
+    await project_cache.invalidate(current_user.id, project_id)
     return project
 
 
+def _deletions_unavailable() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Background deletions are temporarily unavailable",
+        headers={"Retry-After": "5"},
+    )
+
+
+def _deletion_progress(job_id: str):
+    """
+    ``(state, meta)`` of a deletion job: one blocking result-backend read,
+    through the configured Celery app (a bare ``AsyncResult`` would use
+    Celery's default app, which has no result backend).
+    """
+    from celery_app import celery
+
+    meta = celery.backend.get_task_meta(job_id)
+    info = meta.get("result")
+    return meta["status"], info if isinstance(info, dict) else {}
+
+
+@router.get(
+    "/deletions/{job_id}",
+    summary="Progress of an asynchronous project deletion",
+)
+async def get_project_deletion(
+    job_id: str,
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """
+    Report the state of a background deletion started by
+    ``DELETE /projects/{project_id}``. Only its owner can see it; any other
+    job id, including one whose owner record expired, is not found.
+    """
+    try:
+        owner_id = await job_owner(get_redis(), job_id)
+    except RedisError:
+        raise _deletions_unavailable()
+    if owner_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Deletion not found",
+        )
+    state, info = await asyncio.to_thread(_deletion_progress, job_id)
+    return {
+        "job_id": job_id,
+        "state": state,
+        "deleted": info.get("deleted"),
+        "total": info.get("total"),
+    }
+
+
 @router.delete(
     "/{project_id}",
     status_code=status.HTTP_204_NO_CONTENT,
@@ -126,24 +398,50 @@ async def update_project(
 async def delete_project(
     project_id: int,
     session: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     """
     Delete a project owned by the current user.
+
+    Tasks are removed with set-based DELETEs instead of being loaded. Very
+    large projects are deleted by a background job in batches; the response
+    is then 202 with a URL to poll for progress.
     """
     result = await session.execute(
-        select(Project).where(
+        select(Project.id).where(
             Project.id == project_id,
             Project.owner_id == current_user.id,
         )
     )
-    project = result.scalars().first()
-    if not project:
+    if result.scalars().first() is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project not found",
         )
 
-    await session.delete(project)
+    if await count_tasks(session, project_id) > settings.PROJECT_DELETE_ASYNC_THRESHOLD:
+        from celery_app.tasks import delete_project_task
+
+        # Record the owner before queueing, so the job is never visible
+        # without one.
+        job_id = str(uuid.uuid4())
+        try:
+            await remember_job_owner(get_redis(), job_id, current_user.id)
+        except RedisError:
+            raise _deletions_unavailable()
+        delete_project_task.apply_async(
+            (project_id, current_user.id), task_id=job_id
+        )
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content={
+                "job_id": job_id,
+                "status_url": f"/projects/deletions/{job_id}",
+            },
+        )
+
+    await delete_project_rows(session, project_id)
     await session.commit()
+    await project_cache.invalidate(current_user.id, project_id)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
 
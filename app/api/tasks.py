@@ -1,89 +1,651 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from datetime import date
+from typing import Dict, List, Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import delete, insert, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
 
 import models
 import schemas
-from database import get_db
-from celery_app.tasks import send_email_task
+from auth.deps import get_current_user
+from auth.user_cache import CurrentUser
+from database import get_session
+from etag import is_not_modified, not_modified, weak_etag
+from events import publish as publish_events
+from events import task_event
+from exports import export_response
+from notifications import record as record_notification
+from notifications import record_many as record_notifications
+from responses import FastJSONResponse, rows_to_dicts
+from search import SearchUnavailable, search_statement
+from task_stats import TaskCountDeltas, apply_deltas
 
 router = APIRouter()
 
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+MAX_BULK_ITEMS = 5000
+MAX_SEARCH_OFFSET = 1000
+
+# Columns of schemas.TaskRead, selected as plain rows by the list endpoint.
+TASK_READ_COLUMNS = (
+    models.Task.id,
+    models.Task.title,
+    models.Task.description,
+    models.Task.status,
+    models.Task.priority,
+    models.Task.due_date,
+    models.Task.project_id,
+    models.Task.assignee_id,
+)
+
+
+def _filtered_tasks(
+    query,
+    project_id: Optional[int] = None,
+    assignee_id: Optional[int] = None,
+    status: Optional[models.TaskStatus] = None,
+    priority: Optional[models.TaskPriority] = None,
+    due_from: Optional[date] = None,
+    due_to: Optional[date] = None,
+):
+    """Apply the optional server-side task filters to ``query``."""
+    if project_id is not None:
+        query = query.where(models.Task.project_id == project_id)
+    if assignee_id is not None:
+        query = query.where(models.Task.assignee_id == assignee_id)
+    if status is not None:
+        query = query.where(models.Task.status == status)
+    if priority is not None:
+        query = query.where(models.Task.priority == priority)
+    if due_from is not None:
+        query = query.where(models.Task.due_date >= due_from)
+    if due_to is not None:
+        query = query.where(models.Task.due_date <= due_to)
+    return query
+
+
+async def _get_task_or_404(
+    session: AsyncSession, task_id: int, for_update: bool = False
+) -> models.Task:
+    """
+    Load a task or raise 404. Writers pass ``for_update`` to lock the row
+    until commit, so the counter deltas they derive from the old values
+    cannot race another write to the same task.
+    """
+    query = select(models.Task).where(models.Task.id == task_id)
+    if for_update:
+        query = query.with_for_update()
+    result = await session.execute(query)
+    task = result.scalars().first()
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return task
+
+
+async def _assignee_email(
+    session: AsyncSession, assignee_id: Optional[int]
+) -> Optional[str]:
+    """Resolve the e-mail address of a task assignee, if any."""
+    if assignee_id is None:
+        return None
+    result = await session.execute(
+        select(models.User.email).where(models.User.id == assignee_id)
+    )
+    return result.scalars().first()
+
+
+async def _emails_by_user_id(session: AsyncSession, user_ids) -> Dict[int, str]:
+    """Resolve many assignee e-mail addresses in one query."""
+    user_ids = {user_id for user_id in user_ids if user_id is not None}
+    if not user_ids:
+        return {}
+    result = await session.execute(
+        select(models.User.id, models.User.email).where(
+            models.User.id.in_(user_ids)
+        )
+    )
+    return dict(result.all())
+
+
+async def _existing_ids(session: AsyncSession, column, ids) -> set:
+    ids = {value for value in ids if value is not None}
+    if not ids:
+        return set()
+    result = await session.execute(select(column).where(column.in_(ids)))
+    return set(result.scalars().all())
+
+
+def _owned_projects(current_user: CurrentUser):
+    """Subquery of the ids of the projects ``current_user`` owns."""
+    return select(models.Project.id).where(
+        models.Project.owner_id == current_user.id
+    )
+
+
+async def _owned_project_ids(
+    session: AsyncSession, current_user: CurrentUser, ids
+) -> set:
+    """The subset of project ``ids`` owned by ``current_user``."""
+    ids = {value for value in ids if value is not None}
+    if not ids:
+        return set()
+    result = await session.execute(
+        _owned_projects(current_user).where(models.Project.id.in_(ids))
+    )
+    return set(result.scalars().all())
+
+
+def _check_bulk_size(items: list) -> None:
+    if len(items) > MAX_BULK_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {MAX_BULK_ITEMS} items per bulk request",
+        )
+
+
+def _invalid_fields(
+    values: dict, projects: set, users: set
+) -> Optional[str]:
+    """Return why a bulk item cannot be written, or None if it is valid."""
+    status = values.get("status")
+    if status is not None and status not in models.TaskStatus.__members__:
+        return f"Invalid status '{status}'"
+    priority = values.get("priority")
+    if priority is not None and priority not in models.TaskPriority.__members__:
+        return f"Invalid priority '{priority}'"
+    if "project_id" in values and values["project_id"] not in projects:
+        return "Project not found"
+    assignee_id = values.get("assignee_id")
+    if assignee_id is not None and assignee_id not in users:
+        return "Assignee not found"
+    return None
+
+
+def _task_payload(task: models.Task) -> dict:
+    return schemas.TaskRead.model_validate(task).model_dump()
+
+
+def _update_events(old_project_id: int, change: dict, **fields) -> list:
+    """
+    Events for an updated task: an upsert in its (new) project and, when
+    it moved, a deletion in the project it left.
+    """
+    task_id = change["id"]
+    project_id = change.get("project_id", old_project_id)
+    if not fields:
+        fields["changes"] = {k: v for k, v in change.items() if k != "id"}
+    events = [task_event("updated", project_id, task_id, **fields)]
+    if project_id != old_project_id:
+        events.append(task_event("deleted", old_project_id, task_id))
+    return events
+
 
 @router.post("/tasks", response_model=schemas.TaskRead)
-def create_task(
+async def create_task(
     task_in: schemas.TaskCreate,
-    db: Session = Depends(get_db)
+    session: AsyncSession = Depends(get_session),
 ):
     """Create a new task and notify the assigned user via email."""
-    task = models.Task(**task_in.dict())
-    db.add(task)
-    db.commit()
-    db.refresh(task)
-
-    # Send assignment email
-    if task.assigned_to_email:
-        send_email_task.delay(
-            to_email=task.assigned_to_email,
+    task = models.Task(**task_in.model_dump(exclude_none=True))
+    session.add(task)
+    deltas = TaskCountDeltas()
+    deltas.add(task.project_id, task.status, task.priority)
+    await apply_deltas(session, deltas)
+
+    # Assignment email, committed together with the task (outbox)
+    to_email = await _assignee_email(session, task.assignee_id)
+    if to_email:
+        record_notification(
+            session,
+            to_email=to_email,
             subject="New Task Assigned",
             body=f"You have been assigned a new task: '{task.title}' "
                  f"with due date {task.due_date}."
         )
 
+    await session.commit()
+    await session.refresh(task)
+    publish_events([task_event(
+        "created", task.project_id, task.id, task=_task_payload(task)
+    )])
     return task
 
 
-@router.get("/tasks", response_model=List[schemas.TaskRead])
-def list_tasks(db: Session = Depends(get_db)):
-    """List all tasks."""
-    return db.query(models.Task).all()
+@router.get("/tasks", response_model=schemas.TaskPage)
+async def list_tasks(
+    request: Request,
+    project_id: Optional[int] = None,
+    assignee_id: Optional[int] = None,
+    status: Optional[models.TaskStatus] = None,
+    priority: Optional[models.TaskPriority] = None,
+    due_from: Optional[date] = None,
+    due_to: Optional[date] = None,
+    after_id: Optional[int] = Query(
+        None, description="Cursor: return tasks with an id greater than this"
+    ),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    List tasks one page at a time.
+
+    Pagination is keyset-based on ``id``: pass the ``next_cursor`` of the
+    previous page as ``after_id`` to fetch the next one. Pages carry a weak
+    ETag; a matching ``If-None-Match`` gets a 304 without loading the rows.
+    Rows are selected as plain columns and encoded with orjson, skipping
+    per-row ORM and Pydantic work.
+    """
+    def page(*columns):
+        query = _filtered_tasks(
+            select(*columns),
+            project_id=project_id,
+            assignee_id=assignee_id,
+            status=status,
+            priority=priority,
+            due_from=due_from,
+            due_to=due_to,
+        )
+        if after_id is not None:
+            query = query.where(models.Task.id > after_id)
+        # Fetch one extra row to know whether another page exists.
+        return query.order_by(models.Task.id).limit(limit + 1)
+
+    # The ETag hashes the page's ordered (id, version) pairs: any added,
+    # removed or updated row changes it, unlike sums that can cancel out.
+    result = await session.execute(page(models.Task.id, models.Task.version))
+    etag = weak_etag(
+        "tasks", str(request.query_params), [tuple(row) for row in result]
+    )
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+
+    result = await session.execute(page(*TASK_READ_COLUMNS))
+    tasks = rows_to_dicts(result.mappings())
+
+    next_cursor = None
+    if len(tasks) > limit:
+        tasks = tasks[:limit]
+        next_cursor = tasks[-1]["id"]
+
+    return FastJSONResponse(
+        {"items": tasks, "next_cursor": next_cursor},
+        headers={"ETag": etag},
+    )
+
+
+@router.get("/tasks/export")
+async def export_tasks(
+    project_id: Optional[int] = None,
+    assignee_id: Optional[int] = None,
+    status: Optional[models.TaskStatus] = None,
+    priority: Optional[models.TaskPriority] = None,
+    due_from: Optional[date] = None,
+    due_to: Optional[date] = None,
+    fmt: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """Stream the current user's matching tasks as NDJSON or CSV."""
+    query = _filtered_tasks(
+        select(*models.Task.__table__.columns)
+        .join(models.Project, models.Project.id == models.Task.project_id)
+        .where(models.Project.owner_id == current_user.id),
+        project_id=project_id,
+        assignee_id=assignee_id,
+        status=status,
+        priority=priority,
+        due_from=due_from,
+        due_to=due_to,
+    ).order_by(models.Task.id)
+    return export_response(query, fmt, "tasks")
+
+
+@router.get("/tasks/search", response_model=schemas.TaskSearchPage)
+async def search_tasks(
+    q: str = Query(..., min_length=1, max_length=256),
+    project_id: Optional[int] = None,
+    assignee_id: Optional[int] = None,
+    status: Optional[models.TaskStatus] = None,
+    priority: Optional[models.TaskPriority] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0, le=MAX_SEARCH_OFFSET),
+    session: AsyncSession = Depends(get_session),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """
+    Search the titles and descriptions of the tasks in the current user's
+    projects, best matches first.
+
+    Served from the full-text index of the configured database (Postgres
+    tsvector/GIN or SQLite FTS5); see ``search``. Pass ``next_offset`` as
+    ``offset`` to get the next page.
+    """
+    try:
+        query = search_statement(TASK_READ_COLUMNS, q)
+    except SearchUnavailable as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    if query is None:
+        raise HTTPException(status_code=422, detail="Query has no searchable words")
+
+    query = _filtered_tasks(
+        query.where(models.Task.project_id.in_(_owned_projects(current_user))),
+        project_id=project_id,
+        assignee_id=assignee_id,
+        status=status,
+        priority=priority,
+    )
+    result = await session.execute(query.limit(limit + 1).offset(offset))
+    tasks = rows_to_dicts(result.mappings())
+
+    next_offset = None
+    if len(tasks) > limit:
+        tasks = tasks[:limit]
+        next_offset = offset + limit
+
+    return FastJSONResponse({"items": tasks, "next_offset": next_offset})
+
+
+@router.post("/tasks/bulk", response_model=List[schemas.TaskBulkResult])
+async def bulk_create_tasks(
+    items: List[schemas.TaskCreate],
+    session: AsyncSession = Depends(get_session),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """
+    Create many tasks with a single multi-row INSERT ... RETURNING.
+
+    Items referencing unknown assignees, projects the caller does not own
+    or invalid status/priority values are reported as failed; the rest are
+    written in one transaction.
+    """
+    _check_bulk_size(items)
+    rows = [item.model_dump() for item in items]
+    projects = await _owned_project_ids(
+        session, current_user, (row["project_id"] for row in rows)
+    )
+    users = await _existing_ids(
+        session, models.User.id, (row["assignee_id"] for row in rows)
+    )
+
+    results = [schemas.TaskBulkResult(index=i, ok=False) for i in range(len(rows))]
+    valid_indexes, valid_rows = [], []
+    deltas = TaskCountDeltas()
+    for index, row in enumerate(rows):
+        error = _invalid_fields(row, projects, users)
+        if error:
+            results[index].error = error
+            continue
+        # Every row needs the same keys for a multi-row VALUES clause.
+        row["status"] = row["status"] or models.TaskStatus.todo.value
+        row["priority"] = row["priority"] or models.TaskPriority.medium.value
+        valid_indexes.append(index)
+        valid_rows.append(row)
+        deltas.add(row["project_id"], row["status"], row["priority"])
+
+    tasks = []
+    if valid_rows:
+        result = await session.scalars(
+            insert(models.Task).returning(
+                models.Task, sort_by_parameter_order=True
+            ),
+            valid_rows,
+        )
+        tasks = result.all()
+    await apply_deltas(session, deltas)
+
+    emails = await _emails_by_user_id(session, (t.assignee_id for t in tasks))
+    messages = []
+    for index, task in zip(valid_indexes, tasks):
+        results[index] = schemas.TaskBulkResult(
+            index=index,
+            ok=True,
+            id=task.id,
+            task=schemas.TaskRead.model_validate(task),
+        )
+        if task.assignee_id in emails:
+            messages.append({
+                "to_email": emails[task.assignee_id],
+                "subject": "New Task Assigned",
+                "body": f"You have been assigned a new task: '{task.title}' "
+                        f"with due date {task.due_date}.",
+            })
+    record_notifications(session, messages)
+    await session.commit()
+
+    publish_events(
+        task_event("created", task.project_id, task.id, task=_task_payload(task))
+        for task in tasks
+    )
+    return results
+
+
+@router.patch("/tasks/bulk", response_model=List[schemas.TaskBulkResult])
+async def bulk_update_tasks(
+    items: List[schemas.TaskBulkUpdateItem],
+    session: AsyncSession = Depends(get_session),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """
+    Update many tasks with one executemany UPDATE keyed by id.
+
+    Only the fields present in each item are changed. Tasks outside the
+    caller's projects are reported as not found, moves into a project the
+    caller does not own, invalid values and repeats of an id already in
+    the request as failed, per item.
+    """
+    _check_bulk_size(items)
+    changes = [item.model_dump(exclude_unset=True) for item in items]
+
+    result = await session.execute(
+        select(
+            models.Task.id,
+            models.Task.title,
+            models.Task.status,
+            models.Task.priority,
+            models.Task.project_id,
+            models.Task.assignee_id,
+        )
+        .where(
+            models.Task.id.in_({change["id"] for change in changes}),
+            models.Task.project_id.in_(_owned_projects(current_user)),
+        )
+        # Lock the rows (in id order, to avoid deadlocks between batches)
+        # so the counter deltas below are computed from committed values.
+        .order_by(models.Task.id)
+        .with_for_update()
+    )
+    current = {row.id: row for row in result.all()}
+    projects = await _owned_project_ids(
+        session, current_user, (c.get("project_id") for c in changes)
+    )
+    users = await _existing_ids(
+        session, models.User.id, (c.get("assignee_id") for c in changes)
+    )
+
+    results, params, status_changes, events = [], [], [], []
+    deltas = TaskCountDeltas()
+    seen = set()
+    for index, change in enumerate(changes):
+        task_id = change["id"]
+        # Deltas are computed from the rows as read above, so a second
+        # change to the same task would start from stale values.
+        if task_id in seen:
+            error = "Duplicate task id"
+        elif task_id not in current:
+            error = "Task not found"
+        else:
+            error = _invalid_fields(change, projects, users)
+        seen.add(task_id)
+        for field in ("title", "status", "priority"):
+            if error is None and field in change and change[field] is None:
+                error = f"{field} cannot be null"
+        results.append(schemas.TaskBulkResult(
+            index=index, ok=error is None, id=task_id, error=error
+        ))
+        if error:
+            continue
+        params.append(change)
+        old = current[task_id]
+        events.extend(_update_events(old.project_id, change))
+        deltas.move(
+            (old.project_id, old.status, old.priority),
+            (
+                change.get("project_id", old.project_id),
+                change.get("status", old.status),
+                change.get("priority", old.priority),
+            ),
+        )
+        new_status = change.get("status")
+        if new_status is not None and new_status != old.status.value:
+            status_changes.append((
+                change.get("title", old.title),
+                new_status,
+                change.get("assignee_id", old.assignee_id),
+            ))
+
+    if params:
+        await session.execute(update(models.Task), params)
+    await apply_deltas(session, deltas)
+
+    emails = await _emails_by_user_id(session, (c[2] for c in status_changes))
+    record_notifications(session, [
+        {
+            "to_email": emails[assignee_id],
+            "subject": "Task Status Updated",
+            "body": f"Your task '{title}' status has been updated "
+                    f"to '{new_status}'.",
+        }
+        for title, new_status, assignee_id in status_changes
+        if assignee_id in emails
+    ])
+    await session.commit()
+
+    publish_events(events)
+    return results
+
+
+@router.post("/tasks/bulk/delete", response_model=List[schemas.TaskBulkResult])
+async def bulk_delete_tasks(
+    payload: schemas.TaskBulkDelete,
+    session: AsyncSession = Depends(get_session),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """
+    Delete many tasks with a single DELETE ... WHERE id IN (...).
+
+    Tasks outside the caller's projects are reported as not found.
+    """
+    _check_bulk_size(payload.ids)
+    deleted, events = set(), []
+    deltas = TaskCountDeltas()
+    if payload.ids:
+        result = await session.execute(
+            delete(models.Task)
+            .where(
+                models.Task.id.in_(set(payload.ids)),
+                models.Task.project_id.in_(_owned_projects(current_user)),
+            )
+            .returning(
+                models.Task.id,
+                models.Task.project_id,
+                models.Task.status,
+                models.Task.priority,
+            )
+        )
+        for task_id, project_id, status, priority in result.all():
+            deleted.add(task_id)
+            deltas.add(project_id, status, priority, amount=-1)
+            events.append(task_event("deleted", project_id, task_id))
+    await apply_deltas(session, deltas)
+    await session.commit()
+    publish_events(events)
+
+    return [
+        schemas.TaskBulkResult(
+            index=index,
+            ok=task_id in deleted,
+            id=task_id,
+            error=None if task_id in deleted else "Task not found",
+        )
+        for index, task_id in enumerate(payload.ids)
+    ]
 
 
 @router.get("/tasks/{task_id}", response_model=schemas.TaskRead)
-def get_task(task_id: int, db: Session = Depends(get_db)):
-    """Get a single task by ID."""
-    task = db.query(models.Task).filter(models.Task.id == task_id).first()
-    if not task:
+async def get_task(
+    task_id: int,
+    request: Request,
+    response: Response,
+    session: AsyncSession = Depends(get_session),
+):
+    """Get a single task by ID (conditional GET via a weak ETag)."""
+    result = await session.execute(
+        select(models.Task.version).where(models.Task.id == task_id)
+    )
+    version = result.scalars().first()
+    if version is None:
         raise HTTPException(status_code=404, detail="Task not found")
-    return task
+    etag = weak_etag("task", task_id, version)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    return await _get_task_or_404(session, task_id)
 
 
 @router.patch("/tasks/{task_id}", response_model=schemas.TaskRead)
-def update_task(
+async def update_task(
     task_id: int,
     task_in: schemas.TaskUpdate,
-    db: Session = Depends(get_db)
+    session: AsyncSession = Depends(get_session),
 ):
     """Update a task and notify the user if status changes."""
-    task = db.query(models.Task).filter(models.Task.id == task_id).first()
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
+    task = await _get_task_or_404(session, task_id, for_update=True)
 
     old_status = task.status
+    old_project_id = task.project_id
+    old_counted = (task.project_id, task.status, task.priority)
 
-    for key, value in task_in.dict(exclude_unset=True).items():
+    for key, value in task_in.model_dump(exclude_unset=True).items():
         setattr(task, key, value)
 
-    db.commit()
-    db.refresh(task)
+    deltas = TaskCountDeltas()
+    deltas.move(old_counted, (task.project_id, task.status, task.priority))
+    await apply_deltas(session, deltas)
 
-    # Notify if status changed
-    if task.status != old_status and task.assigned_to_email:
-        send_email_task.delay(
-            to_email=task.assigned_to_email,
-            subject="Task Status Updated",
-            body=f"Your task '{task.title}' status has been updated to '{task.status}'."
-        )
+    # Notify if status changed, in the same transaction (outbox)
+    new_status = models.TaskStatus(task.status)
+    if new_status != old_status:
+        to_email = await _assignee_email(session, task.assignee_id)
+        if to_email:
+            record_notification(
+                session,
+                to_email=to_email,
+                subject="Task Status Updated",
+                body=f"Your task '{task.title}' status has been updated "
+                     f"to '{new_status.value}'."
+            )
 
+    await session.commit()
+    await session.refresh(task)
+    publish_events(_update_events(
+        old_project_id, {"id": task.id, "project_id": task.project_id},
+        task=_task_payload(task),
+    ))
     return task
 
 
 @router.delete("/tasks/{task_id}")
-def delete_task(task_id: int, db: Session = Depends(get_db)):
+async def delete_task(
+    task_id: int,
+    session: AsyncSession = Depends(get_session),
+):
     """Delete a task."""
-    task = db.query(models.Task).filter(models.Task.id == task_id).first()
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
-    db.delete(task)
-    db.commit()
+    task = await _get_task_or_404(session, task_id, for_update=True)
+    await session.delete(task)
+    deltas = TaskCountDeltas()
+    deltas.add(task.project_id, task.status, task.priority, amount=-1)
+    await apply_deltas(session, deltas)
+    await session.commit()
+    publish_events([task_event("deleted", task.project_id, task.id)])
     return {"message": "Task deleted successfully"}
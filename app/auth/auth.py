@@ -1,5 +1,7 @@
+import logging
 from datetime import timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
+from redis.exceptions import RedisError
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
@@ -8,16 +10,33 @@ from database import get_session
 from models import User
 from schemas import UserCreate
 from security import (
-    hash_password,
-    verify_password,
+    PasswordHasherBusy,
+    hash_password_async,
+    verify_password_async,
     create_access_token,
+    verified_tokens,
 )
 from config import get_settings
+from auth.deps import get_token_payload, oauth2_scheme
+from auth.revocation import revoke
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 settings = get_settings()
 
+# Seconds a client should wait before retrying a logout Redis refused.
+LOGOUT_RETRY_AFTER = 5
+
+
+def _hasher_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Authentication is temporarily overloaded, retry shortly",
+        headers={"Retry-After": "1"},
+    )
+
 
 @router.post("/register", status_code=status.HTTP_201_CREATED)
 async def register(
@@ -37,9 +56,14 @@ async def register(
             detail="Email already registered",
         )
 
+    try:
+        hashed_password = await hash_password_async(payload.password)
+    except PasswordHasherBusy:
+        raise _hasher_busy()
+
     user = User(
         email=payload.email,
-        hashed_password=hash_password(payload.password),
+        hashed_password=hashed_password,
     )
     session.add(user)
     await session.commit()
@@ -61,10 +85,13 @@ async def login(
         select(User).where(User.email == form_data.username)
     )
     user = result.scalars().first()
-    if (
-        not user
-        or not verify_password(form_data.password, user.hashed_password)
-    ):
+    try:
+        valid = user is not None and await verify_password_async(
+            form_data.password, user.hashed_password
+        )
+    except PasswordHasherBusy:
+        raise _hasher_busy()
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials",
@@ -74,9 +101,36 @@ async def login(
     access_token_expires = timedelta(
         minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
     )
+    claims = {"sub": user.email}
+    if settings.JWT_EMBED_USER_CLAIMS:
+        # Lets protected routes authenticate without a users lookup.
+        claims.update({"uid": user.id, "active": bool(user.is_active)})
     access_token = create_access_token(
-        data={"sub": user.email}, expires_delta=access_token_expires
+        data=claims, expires_delta=access_token_expires
     )
     return {"access_token": access_token, "token_type": "bearer"}
 
 
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    token: str = Depends(oauth2_scheme),
+    payload: dict = Depends(get_token_payload),
+):
+    """
+    Revoke the current access token until it expires.
+
+    The denylist lives in Redis: if it cannot be written the token stays
+    valid, so the client is told to retry rather than that it logged out.
+    """
+    try:
+        await revoke(payload)
+    except RedisError as exc:
+        logger.warning("Token revocation failed: %s", exc)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Logout is temporarily unavailable, retry shortly",
+            headers={"Retry-After": str(LOGOUT_RETRY_AFTER)},
+        )
+    verified_tokens.discard(token)
+
+
@@ -1,41 +1,72 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
 from config import get_settings
 from database import get_session
 from models import User
+from security import decode_access_token
+from auth.revocation import is_revoked
+from auth.user_cache import CurrentUser, user_cache
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 settings = get_settings()
 
 
+async def get_token_payload(token: str = Depends(oauth2_scheme)) -> dict:
+    """Verified, non-revoked claims of the bearer token."""
+    payload = decode_access_token(token)
+    if (
+        payload is None
+        or payload.get("sub") is None
+        or await is_revoked(payload)
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return payload
+
+
+def _require_active(user: CurrentUser) -> CurrentUser:
+    if not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Inactive user",
+        )
+    return user
+
+
 async def get_current_user(
-    token: str = Depends(oauth2_scheme),
+    payload: dict = Depends(get_token_payload),
     session: AsyncSession = Depends(get_session),
-) -> User:
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    try:
-        payload = jwt.decode(
-            token,
-            settings.SECRET_KEY,
-            algorithms=[settings.ALGORITHM],
-        )
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
-    except JWTError:
-        raise credentials_exception
+) -> CurrentUser:
+    email: str = payload["sub"]
+
+    # Tokens issued with embedded user claims need no lookup at all.
+    if settings.JWT_EMBED_USER_CLAIMS and "uid" in payload:
+        return _require_active(CurrentUser(
+            id=payload["uid"],
+            email=email,
+            is_active=bool(payload.get("active", False)),
+        ))
+
+    # Resolved users are cached by token subject to skip the users lookup.
+    cached = await user_cache.get(email)
+    if cached is not None:
+        return _require_active(cached)
 
     result = await session.execute(select(User).where(User.email == email))
     user = result.scalars().first()
     if user is None:
-        raise credentials_exception
-    return user
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
 
+    current_user = CurrentUser.from_orm_user(user)
+    await user_cache.set(current_user)
+    return _require_active(current_user)
@@ -0,0 +1,198 @@
+import time
+
+from fastapi import routing
+from fastapi.responses import JSONResponse
+
+from auth.rate_limit import Limit, RateLimiter, retry_after_header
+from config import get_settings
+from metrics import (
+    IN_FLIGHT,
+    REQUESTS,
+    REQUESTS_REJECTED,
+    REQUEST_DB_TIME,
+    REQUEST_LATENCY,
+    REQUEST_QUERIES,
+    RequestDbStats,
+    current_request_db,
+)
+from security import decode_access_token
+
+# Never limited: scrapes must keep working while the API is under load.
+EXEMPT_PREFIXES = ("/metrics",)
+# Credential endpoints get an extra, much smaller per-IP bucket.
+AUTH_PATHS = ("/auth/login", "/auth/register")
+# Long-lived streams (SSE) do not occupy a concurrency slot.
+STREAMING_SUFFIXES = ("/events",)
+
+
+def _route_templates(app) -> dict:
+    """
+    Map ``id(route)`` to the full path template of each route in ``app``.
+
+    Recent FastAPI versions keep an included router's own routes, so
+    ``scope["route"].path`` lacks the ``include_router`` prefix; the
+    prefixed template is only known to the app's route contexts. Older
+    versions copy the routes with the prefix applied and need no table.
+    """
+    iter_route_contexts = getattr(routing, "iter_route_contexts", None)
+    if iter_route_contexts is None:
+        return {}
+    return {
+        id(context.original_route): context.path
+        for context in iter_route_contexts(app.routes)
+        if context.path is not None
+    }
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording per-route latency, status codes, in-flight
+    requests and the DB queries each request issued.
+
+    Routes are labelled by their path template (``/tasks/tasks/{task_id}``)
+    so label cardinality stays bounded; unmatched paths share one label.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.templates = None
+
+    def _route_label(self, scope) -> str:
+        route = scope.get("route")
+        if getattr(route, "path", None) is None:
+            return "unmatched"
+        if self.templates is None:
+            self.templates = _route_templates(scope["app"])
+        path = self.templates.get(id(route), route.path)
+        return scope.get("root_path", "") + path
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        db_stats = RequestDbStats()
+        token = current_request_db.set(db_stats)
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            IN_FLIGHT.dec()
+            current_request_db.reset(token)
+
+            route = self._route_label(scope)
+            method = scope["method"]
+            REQUESTS.inc(method=method, route=route, status=status_code)
+            REQUEST_LATENCY.observe(elapsed, method=method, route=route)
+            REQUEST_QUERIES.observe(db_stats.queries, method=method, route=route)
+            REQUEST_DB_TIME.observe(db_stats.seconds, method=method, route=route)
+
+
+class RateLimitMiddleware:
+    """
+    ASGI middleware that refuses abusive clients before they reach the
+    database.
+
+    * Token buckets (``auth.rate_limit``): one per user for requests with a
+      valid bearer token, otherwise one per client IP, plus a small per-IP
+      bucket for the login/register endpoints. An empty bucket answers 429
+      with ``Retry-After``.
+    * A per-worker cap of ``MAX_CONCURRENT_REQUESTS`` requests in progress.
+      Beyond it requests are shed at once with 503 instead of queueing for
+      a database connection until they time out.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        settings = get_settings()
+        self.enabled = settings.RATE_LIMIT_ENABLED
+        self.trust_forwarded = settings.RATE_LIMIT_TRUST_FORWARDED
+        self.max_concurrent = settings.MAX_CONCURRENT_REQUESTS
+        self.user_limit = Limit(
+            settings.RATE_LIMIT_USER_RATE, settings.RATE_LIMIT_USER_BURST
+        )
+        self.ip_limit = Limit(
+            settings.RATE_LIMIT_IP_RATE, settings.RATE_LIMIT_IP_BURST
+        )
+        self.auth_limit = Limit(
+            settings.RATE_LIMIT_AUTH_RATE, settings.RATE_LIMIT_AUTH_BURST
+        )
+        self.limiter = RateLimiter(use_redis=settings.RATE_LIMIT_REDIS_ENABLED)
+        self.in_flight = 0
+
+    def _client_ip(self, scope, headers: dict) -> str:
+        if self.trust_forwarded and b"x-forwarded-for" in headers:
+            return headers[b"x-forwarded-for"].split(b",")[0].strip().decode()
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    def _buckets(self, scope):
+        headers = dict(scope["headers"])
+        ip = self._client_ip(scope, headers)
+        buckets = []
+        if scope["path"] in AUTH_PATHS:
+            buckets.append((f"auth:{ip}", self.auth_limit))
+
+        user = None
+        authorization = headers.get(b"authorization", b"").decode("latin-1")
+        scheme, _, token = authorization.partition(" ")
+        if scheme.lower() == "bearer" and token:
+            payload = decode_access_token(token)
+            user = payload.get("sub") if payload else None
+        if user is not None:
+            buckets.append((f"user:{user}", self.user_limit))
+        else:
+            buckets.append((f"ip:{ip}", self.ip_limit))
+        return buckets
+
+    async def _reject(self, scope, receive, send, status_code, retry_after, reason):
+        REQUESTS_REJECTED.inc(reason=reason)
+        detail = (
+            "Too many requests" if status_code == 429
+            else "Server is busy, retry shortly"
+        )
+        response = JSONResponse(
+            {"detail": detail},
+            status_code=status_code,
+            headers={"Retry-After": retry_after_header(retry_after)},
+        )
+        await response(scope, receive, send)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith(EXEMPT_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+
+        limited = (
+            self.max_concurrent > 0
+            and not scope["path"].endswith(STREAMING_SUFFIXES)
+        )
+        if limited and self.in_flight >= self.max_concurrent:
+            await self._reject(scope, receive, send, 503, 1, "overload")
+            return
+
+        if limited:
+            self.in_flight += 1
+        try:
+            if self.enabled:
+                for key, limit in self._buckets(scope):
+                    allowed, retry_after = await self.limiter.take(key, limit)
+                    if not allowed:
+                        await self._reject(
+                            scope, receive, send, 429, retry_after, "rate_limit"
+                        )
+                        return
+            await self.app(scope, receive, send)
+        finally:
+            if limited:
+                self.in_flight -= 1
@@ -0,0 +1,109 @@
+"""
+Token-bucket rate limits shared by all workers through Redis.
+
+Each bucket holds up to ``burst`` tokens and refills at ``rate`` tokens per
+second; a request takes one token or is refused with the number of seconds
+until one is available. The refill-and-take step runs as a Lua script, so
+it is atomic across workers and uses the Redis clock rather than each
+worker's own.
+
+If Redis cannot be reached the limiter falls back to per-worker in-memory
+buckets (so the effective limit is multiplied by the number of workers)
+and retries Redis after ``REDIS_RETRY_SECONDS`` instead of paying for a
+failed round trip on every request.
+"""
+import logging
+import math
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Tuple
+
+logger = logging.getLogger(__name__)
+
+BUCKET_KEY = "ratelimit:{}"
+REDIS_RETRY_SECONDS = 5.0
+
+TOKEN_BUCKET_LUA = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+local retry_after = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+else
+    retry_after = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return {allowed, tostring(retry_after)}
+"""
+
+
+class Limit(NamedTuple):
+    rate: float   # tokens per second
+    burst: int    # bucket capacity
+
+
+class LocalTokenBuckets:
+    """In-process token buckets, LRU-bounded to ``max_size`` keys."""
+
+    def __init__(self, max_size: int = 100_000):
+        self.max_size = max_size
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    def take(self, key: str, limit: Limit) -> Tuple[bool, float]:
+        now = time.monotonic()
+        tokens, ts = self._buckets.pop(key, (limit.burst, now))
+        tokens = min(limit.burst, tokens + (now - ts) * limit.rate)
+        if tokens >= 1:
+            allowed, retry_after = True, 0.0
+            tokens -= 1
+        else:
+            allowed, retry_after = False, (1 - tokens) / limit.rate
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_size:
+            self._buckets.popitem(last=False)
+        return allowed, retry_after
+
+
+class RateLimiter:
+    def __init__(self, use_redis: bool = True):
+        self.use_redis = use_redis
+        self.local = LocalTokenBuckets()
+        self._script = None
+        self._redis_down_until = 0.0
+        self.redis_errors = 0
+
+    def _redis_script(self):
+        if self._script is None:
+            from redis_client import get_redis
+            self._script = get_redis().register_script(TOKEN_BUCKET_LUA)
+        return self._script
+
+    async def take(self, key: str, limit: Limit) -> Tuple[bool, float]:
+        """Take a token from ``key``'s bucket: ``(allowed, retry_after)``."""
+        if self.use_redis and time.monotonic() >= self._redis_down_until:
+            try:
+                allowed, retry_after = await self._redis_script()(
+                    keys=[BUCKET_KEY.format(key)],
+                    args=[limit.rate, limit.burst],
+                )
+                return bool(int(allowed)), float(retry_after)
+            except Exception as exc:
+                self.redis_errors += 1
+                self._redis_down_until = time.monotonic() + REDIS_RETRY_SECONDS
+                logger.warning(
+                    "Rate limiter falling back to local buckets: %s", exc
+                )
+        return self.local.take(key, limit)
+
+
+def retry_after_header(seconds: float) -> str:
+    return str(max(1, math.ceil(seconds)))
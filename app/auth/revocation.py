@@ -0,0 +1,42 @@
+"""
+Compact Redis denylist of revoked access tokens.
+
+Only the token's ``jti`` is stored, under a key that expires together with
+the token, so the denylist never outgrows the set of still-valid revoked
+tokens. If Redis cannot be reached the check fails open (and logs), since
+refusing every request would turn a cache outage into a full outage.
+"""
+import logging
+import time
+
+from config import get_settings
+from redis_client import get_redis, record_failure, redis_available
+
+logger = logging.getLogger(__name__)
+
+DENY_KEY = "auth:deny:{}"
+
+settings = get_settings()
+
+
+async def revoke(payload: dict) -> None:
+    jti = payload.get("jti")
+    if not jti:
+        return
+    ttl = int(payload.get("exp", 0) - time.time())
+    if ttl > 0:
+        await get_redis().set(DENY_KEY.format(jti), "1", ex=ttl)
+
+
+async def is_revoked(payload: dict) -> bool:
+    if not settings.JWT_DENYLIST_ENABLED:
+        return False
+    jti = payload.get("jti")
+    if not jti or not redis_available():
+        return False
+    try:
+        return bool(await get_redis().exists(DENY_KEY.format(jti)))
+    except Exception as exc:
+        record_failure(exc)
+        logger.warning("Token denylist check failed: %s", exc)
+        return False
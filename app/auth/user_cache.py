@@ -0,0 +1,153 @@
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+from sqlalchemy import event, inspect
+
+from config import get_settings
+from models import User
+from redis_client import record_failure, redis_available
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CurrentUser:
+    """Snapshot of the authenticated user, safe to share between requests."""
+    id: int
+    email: str
+    is_active: bool
+
+    @classmethod
+    def from_orm_user(cls, user: User) -> "CurrentUser":
+        return cls(id=user.id, email=user.email, is_active=bool(user.is_active))
+
+
+class UserCache:
+    """
+    Bounded TTL/LRU cache of authenticated users keyed by token subject.
+
+    Entries live in process memory and, when ``redis_enabled`` is set, are
+    also written to Redis so that other workers can resolve the user without
+    a database round trip. Local entries expire after ``ttl`` seconds, which
+    bounds how long another worker may serve a stale snapshot after an
+    invalidation.
+    """
+
+    KEY_PREFIX = "auth:user:"
+
+    def __init__(self, max_size: int, ttl: int, redis_enabled: bool = False):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.redis_enabled = redis_enabled
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self.hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+
+    def _redis(self):
+        from redis_client import get_redis
+        return get_redis()
+
+    def _get_local(self, subject: str) -> Optional[CurrentUser]:
+        entry = self._entries.get(subject)
+        if entry is None:
+            return None
+        expires_at, user = entry
+        if expires_at < time.monotonic():
+            del self._entries[subject]
+            return None
+        self._entries.move_to_end(subject)
+        return user
+
+    def _set_local(self, subject: str, user: CurrentUser) -> None:
+        self._entries[subject] = (time.monotonic() + self.ttl, user)
+        self._entries.move_to_end(subject)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def get(self, subject: str) -> Optional[CurrentUser]:
+        user = self._get_local(subject)
+        if user is not None:
+            self.hits += 1
+            return user
+
+        if self.redis_enabled and redis_available():
+            try:
+                raw = await self._redis().get(self.KEY_PREFIX + subject)
+            except Exception as exc:
+                record_failure(exc)
+                logger.warning("User cache Redis lookup failed: %s", exc)
+                raw = None
+            if raw is not None:
+                user = CurrentUser(**json.loads(raw))
+                self._set_local(subject, user)
+                self.redis_hits += 1
+                return user
+
+        self.misses += 1
+        return None
+
+    async def set(self, user: CurrentUser) -> None:
+        self._set_local(user.email, user)
+        if self.redis_enabled and redis_available():
+            try:
+                await self._redis().set(
+                    self.KEY_PREFIX + user.email,
+                    json.dumps(asdict(user)),
+                    ex=self.ttl,
+                )
+            except Exception as exc:
+                record_failure(exc)
+                logger.warning("User cache Redis write failed: %s", exc)
+
+    def invalidate(self, subject: str) -> None:
+        """Drop ``subject`` locally and, if possible, from Redis."""
+        self._entries.pop(subject, None)
+        if not self.redis_enabled:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        loop.create_task(self._invalidate_redis(subject))
+
+    async def _invalidate_redis(self, subject: str) -> None:
+        try:
+            await self._redis().delete(self.KEY_PREFIX + subject)
+        except Exception as exc:
+            record_failure(exc)
+            logger.warning("User cache Redis invalidation failed: %s", exc)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+        }
+
+
+settings = get_settings()
+
+user_cache = UserCache(
+    max_size=settings.USER_CACHE_MAX_SIZE,
+    ttl=settings.USER_CACHE_TTL_SECONDS,
+    redis_enabled=settings.USER_CACHE_REDIS_ENABLED,
+)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_changed_user(mapper, connection, target: User) -> None:
+    # Also drop the previous address when the e-mail itself was changed.
+    previous = inspect(target).attrs.email.history.deleted or ()
+    for email in {target.email, *previous}:
+        user_cache.invalidate(email)
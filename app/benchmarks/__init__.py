@@ -0,0 +1,7 @@
+"""
+Stand-alone performance benchmarks.
+
+Run them from the ``app`` directory, e.g.::
+
+    python -m benchmarks.task_indexes --tasks 1000000
+"""
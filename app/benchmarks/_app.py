@@ -0,0 +1,51 @@
+"""In-process app harness for the HTTP benchmarks (ASGI transport, no server)."""
+import asyncio
+import os
+from contextlib import asynccontextmanager
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def use_database(url: str) -> None:
+    """Point the app at ``url``; must run before any app module is imported."""
+    os.environ["DATABASE_URL"] = url
+    # Benchmarks drive the app from one address far above the per-client
+    # limits; keep rate limiting off unless explicitly enabled.
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+
+def migrate() -> None:
+    """Bring the configured database to the latest migration."""
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config(os.path.join(APP_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(APP_DIR, "migrations"))
+    command.upgrade(config, "head")
+
+
+@asynccontextmanager
+async def app_client():
+    """Yield an httpx client bound to a freshly started application."""
+    import httpx
+
+    import main
+
+    # env.py runs its own event loop, so migrate from a worker thread.
+    await asyncio.to_thread(migrate)
+    await main.on_startup()
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        yield client
+
+
+async def register_and_login(client, email: str, password: str) -> str:
+    """Create ``email`` (if needed) and return a bearer token for it."""
+    await client.post("/auth/register", json={"email": email, "password": password})
+    response = await client.post(
+        "/auth/login", data={"username": email, "password": password}
+    )
+    response.raise_for_status()
+    return response.json()["access_token"]
@@ -0,0 +1,45 @@
+"""Small helpers shared by the benchmark scripts."""
+import json
+import statistics
+import time
+from contextlib import contextmanager
+from typing import Dict, List
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of ``samples`` (``pct`` in 0..100)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Latency summary in milliseconds for a list of durations in seconds."""
+    return {
+        "count": len(samples),
+        "mean_ms": round(statistics.fmean(samples) * 1000, 3) if samples else 0.0,
+        "p50_ms": round(percentile(samples, 50) * 1000, 3),
+        "p95_ms": round(percentile(samples, 95) * 1000, 3),
+        "p99_ms": round(percentile(samples, 99) * 1000, 3),
+    }
+
+
+@contextmanager
+def stopwatch(samples: List[float]):
+    """Append the wall-clock duration of the block to ``samples``."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        samples.append(time.perf_counter() - start)
+
+
+def dump(results: dict, path: str = None) -> None:
+    """Print ``results`` as JSON and optionally write them to ``path``."""
+    text = json.dumps(results, indent=2, default=str)
+    print(text)
+    if path:
+        with open(path, "w") as fh:
+            fh.write(text + "\n")
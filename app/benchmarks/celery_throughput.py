@@ -0,0 +1,125 @@
+"""
+Celery dispatch/throughput harness on in-memory transports (no Redis).
+
+Reports, for the settings-driven app in ``celery_app``:
+
+* ``eager``     - task_always_eager calls (pure task + Celery call overhead)
+* ``enqueue``   - apply_async publish rate to the in-memory broker
+* ``roundtrip`` - publish + consume through an in-process worker
+
+The numbers depend on the transport, not only on the worker settings.
+kombu's ``memory://`` broker is polled (every 1 s by default), and the
+worker serves it from Celery's blocking loop, which only runs the acks of
+finished tasks between ``drain_events`` calls of up to 2 s. Left as is, the
+roundtrip measures those waits - about 8 tasks/s at the default prefetch -
+and rewards a larger prefetch for the wrong reason. The harness polls every
+``POLL_INTERVAL`` seconds and returns to the loop as often; even so, the
+results only compare configurations with each other, not with a Redis
+broker.
+
+Compare configurations by exporting the usual settings first, e.g.::
+
+    CELERY_PREFETCH_MULTIPLIER=1 CELERY_TASK_COMPRESSION=gzip \\
+        python -m benchmarks.celery_throughput --tasks 5000
+"""
+import argparse
+import os
+import threading
+import time
+
+from benchmarks._common import dump
+
+_done = threading.Semaphore(0)
+
+# memory:// polling interval for the in-process worker (kombu default: 1 s)
+POLL_INTERVAL = 0.001
+
+
+def _return_to_worker_loop(interval: float) -> None:
+    """
+    Cap the memory transport's blocking drain at ``interval`` so the
+    worker's loop gets back to its pending acks after every poll.
+    """
+    from kombu.transport import memory
+
+    drain_events = memory.Transport.drain_events
+
+    def capped(self, connection, timeout=None):
+        if timeout is None or timeout > interval:
+            timeout = interval
+        return drain_events(self, connection, timeout=timeout)
+
+    memory.Transport.drain_events = capped
+
+
+def _rate(count: int, elapsed: float) -> float:
+    return round(count / elapsed, 1) if elapsed else 0.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--payload-bytes", type=int, default=512)
+    parser.add_argument("--output", help="also write the JSON report here")
+    args = parser.parse_args()
+
+    os.environ["CELERY_BROKER_URL"] = "memory://"
+    os.environ["CELERY_RESULT_BACKEND"] = "cache+memory://"
+    from celery.contrib.testing.worker import start_worker
+
+    from celery_app import DEFAULT_QUEUE, celery
+
+    @celery.task(name="benchmarks.noop", ignore_result=True)
+    def noop(payload):
+        _done.release()
+
+    payload = "x" * args.payload_bytes
+    report = {
+        "tasks": args.tasks,
+        "prefetch_multiplier": celery.conf.worker_prefetch_multiplier,
+        "acks_late": celery.conf.task_acks_late,
+        "compression": celery.conf.task_compression,
+    }
+
+    celery.conf.task_always_eager = True
+    start = time.perf_counter()
+    for _ in range(args.tasks):
+        noop.delay(payload)
+    report["eager_tasks_per_s"] = _rate(args.tasks, time.perf_counter() - start)
+    for _ in range(args.tasks):
+        _done.acquire()
+    celery.conf.task_always_eager = False
+
+    start = time.perf_counter()
+    for _ in range(args.tasks):
+        noop.apply_async((payload,), queue=DEFAULT_QUEUE)
+    report["enqueue_tasks_per_s"] = _rate(args.tasks, time.perf_counter() - start)
+
+    celery.conf.broker_transport_options = {"polling_interval": POLL_INTERVAL}
+    _return_to_worker_loop(POLL_INTERVAL)
+    report["broker_polling_interval_s"] = POLL_INTERVAL
+    with start_worker(
+        celery,
+        pool="threads",
+        concurrency=args.concurrency,
+        perform_ping_check=False,
+        shutdown_timeout=30,
+    ):
+        # Drain the backlog published above, then time a fresh roundtrip.
+        for _ in range(args.tasks):
+            _done.acquire()
+        start = time.perf_counter()
+        for _ in range(args.tasks):
+            noop.apply_async((payload,), queue=DEFAULT_QUEUE)
+        for _ in range(args.tasks):
+            _done.acquire()
+        report["roundtrip_tasks_per_s"] = _rate(
+            args.tasks, time.perf_counter() - start
+        )
+
+    dump(report, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Measure worker cold start: importing ``main`` plus the startup hook.
+
+Each sample is a fresh interpreter, as for a newly scheduled uvicorn worker.
+The stand-in database is migrated once up front, so startup only pays for
+the schema revision check. Also reports whether the heavy optional imports
+(passlib, Celery) stayed off the boot path::
+
+    python -m benchmarks.cold_start --runs 20
+    python -m benchmarks.cold_start --url postgresql+asyncpg://postgres:pw@localhost/bench
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+from benchmarks._app import APP_DIR
+from benchmarks._common import dump, summarize
+
+LAZY_MODULES = ("passlib", "celery")
+
+# Runs in the child interpreter; prints one JSON line.
+CHILD = """
+import asyncio, json, sys, time
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+asyncio.run(main.on_startup())
+started = time.perf_counter()
+print(json.dumps({
+    "import": imported - start,
+    "startup": started - imported,
+    "loaded": [m for m in %r if m in sys.modules],
+}))
+"""
+
+
+def migrate(url: str) -> None:
+    env = dict(os.environ, DATABASE_URL=url)
+    subprocess.run(
+        [sys.executable, "-c", "from benchmarks._app import migrate; migrate()"],
+        cwd=APP_DIR, env=env, check=True,
+    )
+
+
+def sample(url: str) -> dict:
+    env = dict(os.environ, DATABASE_URL=url)
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD % (LAZY_MODULES,)],
+        cwd=APP_DIR, env=env, check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default="sqlite+aiosqlite:///./bench_cold.db",
+                        help="async SQLAlchemy URL of the stand-in DB")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--skip-migrate", action="store_true",
+                        help="the database at --url is already migrated")
+    parser.add_argument("--output", help="also write the JSON report here")
+    args = parser.parse_args()
+
+    if not args.skip_migrate:
+        migrate(args.url)
+
+    samples = [sample(args.url) for _ in range(args.runs)]
+    dump({
+        "runs": args.runs,
+        "url": args.url,
+        "import": summarize([s["import"] for s in samples]),
+        "startup": summarize([s["startup"] for s in samples]),
+        "total": summarize([s["import"] + s["startup"] for s in samples]),
+        "eagerly_loaded": sorted({m for s in samples for m in s["loaded"]}),
+    }, args.output)
+
+
+if __name__ == "__main__":
+    main()
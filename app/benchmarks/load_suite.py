@@ -0,0 +1,340 @@
+"""
+Replay a weighted request mix against the whole API and report per-route
+throughput and latency percentiles.
+
+The stand-in database (SQLite by default, or Postgres via ``--url``) is
+migrated and seeded with users, projects and tasks through the API itself.
+The mix then runs either in-process over the ASGI transport or against a
+uvicorn server (started here, or an existing one with ``--base-url``)::
+
+    python -m benchmarks.load_suite --duration 30 --output load.json
+    python -m benchmarks.load_suite --mode uvicorn --workers 4
+    python -m benchmarks.load_suite --workload my_mix.jsonl --concurrency 64
+
+Workload files are JSON Lines, one request template per line::
+
+    {"name": "tasks.get", "weight": 15, "method": "GET",
+     "path": "/tasks/tasks/{task_id}"}
+
+``name`` labels the route in the report; its prefix before the first dot
+is the router it is grouped under. Optional keys: ``weight`` (default 1),
+``auth`` (send the user's bearer token, default true), ``json`` or
+``form`` (request body) and ``expect`` (accepted status codes, default any
+2xx/3xx). Strings in ``path`` and bodies may use the placeholders
+``{project_id}``, ``{task_id}``, ``{word}``, ``{n}`` (a unique counter),
+``{email}`` and ``{password}``; a string that is exactly one placeholder
+is replaced by the raw value, so ids stay integers.
+
+Routes and routers are reported in sorted order so two runs diff cleanly.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from benchmarks import _app
+from benchmarks._common import dump, stopwatch, summarize
+
+DEFAULT_WORKLOAD = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "workloads", "default.jsonl"
+)
+PASSWORD = "load-password"
+WORDS = (
+    "invoice", "deploy", "onboarding", "migration", "release", "billing",
+    "dashboard", "search", "report", "security", "backup", "checkout",
+)
+SEED_BULK_SIZE = 5000
+
+
+@dataclass
+class SeededUser:
+    email: str
+    token: str
+    project_ids: List[int] = field(default_factory=list)
+    task_ids: List[int] = field(default_factory=list)
+
+
+def load_workload(path: str) -> List[dict]:
+    templates = []
+    with open(path) as fh:
+        for line in fh:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                templates.append(json.loads(line))
+    if not templates:
+        raise SystemExit(f"{path}: empty workload")
+    return templates
+
+
+def render(value, values: dict):
+    """Fill the placeholders of a template value (recursing into bodies)."""
+    if isinstance(value, dict):
+        return {key: render(item, values) for key, item in value.items()}
+    if isinstance(value, list):
+        return [render(item, values) for item in value]
+    if isinstance(value, str):
+        if value.startswith("{") and value.endswith("}") and value[1:-1] in values:
+            return values[value[1:-1]]
+        return value.format(**values)
+    return value
+
+
+async def seed(client, args, run_id: str) -> List[SeededUser]:
+    """Create users, their projects and tasks through the public API."""
+    rnd = random.Random(args.seed)
+    users = []
+    for i in range(args.users):
+        email = f"load{i}-{run_id}@example.com"
+        token = await _app.register_and_login(client, email, PASSWORD)
+        users.append(SeededUser(email=email, token=token))
+
+    for user in users:
+        headers = {"Authorization": f"Bearer {user.token}"}
+        for p in range(args.projects):
+            response = await client.post(
+                "/projects/", json={"name": f"project {p}"}, headers=headers
+            )
+            response.raise_for_status()
+            user.project_ids.append(response.json()["id"])
+
+        rows = [
+            {
+                "title": f"{rnd.choice(WORDS)} task {t}",
+                "description": " ".join(rnd.choices(WORDS, k=8)),
+                "status": rnd.choice(("todo", "in_progress", "done")),
+                "priority": rnd.choice(("low", "medium", "high")),
+                "project_id": project_id,
+            }
+            for project_id in user.project_ids
+            for t in range(args.tasks)
+        ]
+        for start in range(0, len(rows), SEED_BULK_SIZE):
+            response = await client.post(
+                "/tasks/tasks/bulk",
+                json=rows[start:start + SEED_BULK_SIZE],
+                headers=headers,
+            )
+            response.raise_for_status()
+            user.task_ids.extend(r["id"] for r in response.json() if r["ok"])
+    return users
+
+
+def _accepted(template: dict, status: int) -> bool:
+    expect = template.get("expect")
+    if expect:
+        return status in expect
+    return 200 <= status < 400
+
+
+async def worker(
+    client, worker_id: int, templates, users, args, deadline: float,
+    counter, samples: Dict[str, list], statuses: Dict[str, dict],
+    errors: Dict[str, int],
+):
+    rnd = random.Random(args.seed * 1000 + worker_id)
+    weights = [template.get("weight", 1) for template in templates]
+    user = users[worker_id % len(users)]
+    while time.perf_counter() < deadline:
+        template = rnd.choices(templates, weights)[0]
+        values = {
+            "project_id": rnd.choice(user.project_ids),
+            "task_id": rnd.choice(user.task_ids),
+            "word": rnd.choice(WORDS),
+            "n": next(counter),
+            "email": user.email,
+            "password": PASSWORD,
+        }
+        headers = {}
+        if template.get("auth", True):
+            headers["Authorization"] = f"Bearer {user.token}"
+        kwargs = {"headers": headers}
+        if "json" in template:
+            kwargs["json"] = render(template["json"], values)
+        if "form" in template:
+            kwargs["data"] = render(template["form"], values)
+
+        name = template["name"]
+        with stopwatch(samples[name]):
+            response = await client.request(
+                template["method"], render(template["path"], values), **kwargs
+            )
+        status = str(response.status_code)
+        statuses[name][status] = statuses[name].get(status, 0) + 1
+        if not _accepted(template, response.status_code):
+            errors[name] += 1
+
+
+async def replay(client, templates, users, args) -> dict:
+    samples, statuses, errors = defaultdict(list), defaultdict(dict), defaultdict(int)
+    counter = itertools.count()
+    if args.warmup:
+        deadline = time.perf_counter() + args.warmup
+        await asyncio.gather(*[
+            worker(client, i, templates, users, args, deadline, counter,
+                   defaultdict(list), defaultdict(dict), defaultdict(int))
+            for i in range(args.concurrency)
+        ])
+
+    started = time.perf_counter()
+    deadline = started + args.duration
+    await asyncio.gather(*[
+        worker(client, i, templates, users, args, deadline, counter,
+               samples, statuses, errors)
+        for i in range(args.concurrency)
+    ])
+    elapsed = time.perf_counter() - started
+    return report(samples, statuses, errors, elapsed)
+
+
+def report(samples, statuses, errors, elapsed: float) -> dict:
+    def section(durations, error_count, status_counts=None):
+        entry = summarize(durations)
+        entry["throughput_rps"] = round(len(durations) / elapsed, 2)
+        entry["errors"] = error_count
+        if status_counts is not None:
+            entry["statuses"] = dict(sorted(status_counts.items()))
+        return entry
+
+    by_router = defaultdict(list)
+    router_errors = defaultdict(int)
+    for name, durations in samples.items():
+        router = name.split(".", 1)[0]
+        by_router[router].extend(durations)
+        router_errors[router] += errors[name]
+
+    everything = [d for durations in samples.values() for d in durations]
+    return {
+        "elapsed_s": round(elapsed, 3),
+        "total": section(everything, sum(errors.values())),
+        "routers": {
+            router: section(by_router[router], router_errors[router])
+            for router in sorted(by_router)
+        },
+        "routes": {
+            name: section(samples[name], errors[name], statuses[name])
+            for name in sorted(samples)
+        },
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_uvicorn(workers: int):
+    """Launch uvicorn on a free port; returns (process, base_url)."""
+    port = _free_port()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1",
+         "--port", str(port), "--workers", str(workers), "--log-level", "warning"],
+        cwd=_app.APP_DIR,
+        env=dict(os.environ),
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit("uvicorn exited during startup")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return process, f"http://127.0.0.1:{port}"
+        except OSError:
+            time.sleep(0.1)
+    process.terminate()
+    raise SystemExit("uvicorn did not start within 30s")
+
+
+async def run(args, templates) -> dict:
+    run_id = f"{int(time.time())}-{os.getpid()}"
+    if args.mode == "inprocess":
+        async with _app.app_client() as client:
+            users = await seed(client, args, run_id)
+            return await replay(client, templates, users, args)
+
+    import httpx
+
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(
+        base_url=args.base_url, limits=limits, timeout=30
+    ) as client:
+        users = await seed(client, args, run_id)
+        return await replay(client, templates, users, args)
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=_app.APP_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default="sqlite+aiosqlite:///./bench_load.db",
+                        help="async SQLAlchemy URL of the stand-in DB")
+    parser.add_argument("--mode", choices=("inprocess", "uvicorn"),
+                        default="inprocess")
+    parser.add_argument("--base-url",
+                        help="with --mode uvicorn: use this running server")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="uvicorn worker processes (--mode uvicorn)")
+    parser.add_argument("--workload", default=DEFAULT_WORKLOAD)
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--projects", type=int, default=5,
+                        help="projects per user")
+    parser.add_argument("--tasks", type=int, default=200,
+                        help="tasks per project")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=20)
+    parser.add_argument("--warmup", type=float, default=2)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="also write the JSON report here")
+    args = parser.parse_args()
+
+    templates = load_workload(args.workload)
+    _app.use_database(args.url)
+
+    server = None
+    if args.mode == "uvicorn" and not args.base_url:
+        _app.migrate()
+        server, args.base_url = start_uvicorn(args.workers)
+    try:
+        results = asyncio.run(run(args, templates))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    dump({
+        "revision": _git_revision(),
+        "config": {
+            "mode": args.mode,
+            "url": args.url,
+            "base_url": args.base_url if server is None else None,
+            "workload": os.path.basename(args.workload),
+            "users": args.users,
+            "projects_per_user": args.projects,
+            "tasks_per_project": args.tasks,
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "workers": args.workers if args.mode == "uvicorn" else None,
+        },
+        **results,
+    }, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Measure ``GET /projects/`` latency while ``POST /auth/login`` is hammered.
+
+bcrypt verification used to run on the event loop, so a login burst stalled
+every other request in the worker. This drives both routes concurrently
+through the in-process ASGI app and reports the ``/projects`` percentiles::
+
+    python -m benchmarks.login_load --logins 32 --duration 10
+    PASSWORD_HASH_WORKERS=0 python -m benchmarks.login_load   # inline hashing
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks import _app
+from benchmarks._common import dump, stopwatch, summarize
+
+PASSWORD = "bench-password"
+
+
+async def hammer_login(client, email: str, deadline: float, statuses: dict):
+    while time.perf_counter() < deadline:
+        response = await client.post(
+            "/auth/login", data={"username": email, "password": PASSWORD}
+        )
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+
+async def probe_projects(client, token: str, deadline: float, samples: list):
+    headers = {"Authorization": f"Bearer {token}"}
+    while time.perf_counter() < deadline:
+        with stopwatch(samples):
+            response = await client.get("/projects/", headers=headers)
+        response.raise_for_status()
+        await asyncio.sleep(0.005)
+
+
+async def run(args) -> dict:
+    async with _app.app_client() as client:
+        token = await _app.register_and_login(client, "bench@example.com", PASSWORD)
+        await client.post(
+            "/projects/",
+            json={"name": "bench"},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+
+        baseline = []
+        deadline = time.perf_counter() + min(args.duration, 3)
+        await probe_projects(client, token, deadline, baseline)
+
+        loaded, statuses = [], {}
+        deadline = time.perf_counter() + args.duration
+        await asyncio.gather(
+            probe_projects(client, token, deadline, loaded),
+            *[
+                hammer_login(client, "bench@example.com", deadline, statuses)
+                for _ in range(args.logins)
+            ],
+        )
+
+    from config import get_settings
+    settings = get_settings()
+    return {
+        "hash_executor": settings.PASSWORD_HASH_EXECUTOR,
+        "hash_workers": settings.PASSWORD_HASH_WORKERS,
+        "concurrent_logins": args.logins,
+        "projects_idle": summarize(baseline),
+        "projects_under_login_load": summarize(loaded),
+        "login_status_counts": statuses,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url",
+                        default="sqlite+aiosqlite:///./bench_login.db")
+    parser.add_argument("--logins", type=int, default=32,
+                        help="concurrent login loops")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--output", help="also write the JSON report here")
+    args = parser.parse_args()
+
+    _app.use_database(args.database_url)
+    dump(asyncio.run(run(args)), args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Micro-benchmark of list serialization: the ``response_model`` path
+(``from_attributes`` validation + JSON encoding per ORM object, as FastAPI
+does for ``List[TaskRead]``) against plain column rows encoded with orjson
+(``responses.FastJSONResponse``)::
+
+    python -m benchmarks.serialization --rows 10000
+"""
+import argparse
+import datetime
+import json
+import time
+from typing import List
+
+from pydantic import TypeAdapter
+
+import models
+import schemas
+from benchmarks._common import dump, summarize
+from responses import dumps
+
+
+def make_tasks(count: int) -> List[models.Task]:
+    today = datetime.date.today()
+    return [
+        models.Task(
+            id=i,
+            title=f"task {i}",
+            description="a reasonably sized description " * 3,
+            status=models.TaskStatus.in_progress,
+            priority=models.TaskPriority.high,
+            due_date=today,
+            project_id=i % 100,
+            assignee_id=i % 50,
+        )
+        for i in range(count)
+    ]
+
+
+def as_rows(tasks: List[models.Task]) -> List[dict]:
+    """What ``select(*TASK_READ_COLUMNS)`` + ``rows_to_dicts`` yields."""
+    return [
+        {
+            "id": t.id, "title": t.title, "description": t.description,
+            "status": t.status, "priority": t.priority, "due_date": t.due_date,
+            "project_id": t.project_id, "assignee_id": t.assignee_id,
+        }
+        for t in tasks
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--output", help="also write the JSON report here")
+    args = parser.parse_args()
+
+    tasks = make_tasks(args.rows)
+    rows = as_rows(tasks)
+    adapter = TypeAdapter(List[schemas.TaskRead])
+
+    def response_model_path() -> bytes:
+        validated = adapter.validate_python(tasks, from_attributes=True)
+        return json.dumps(
+            adapter.dump_python(validated, mode="json")
+        ).encode()
+
+    def lean_path() -> bytes:
+        return dumps({"items": rows, "next_cursor": None})
+
+    # Both paths must describe the same items.
+    assert json.loads(response_model_path()) == json.loads(lean_path())["items"]
+
+    report = {"rows": args.rows}
+    for name, func in (("response_model", response_model_path),
+                       ("orjson_rows", lean_path)):
+        samples = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            func()
+            samples.append(time.perf_counter() - start)
+        report[name] = summarize(samples)
+    report["speedup"] = round(
+        report["response_model"]["mean_ms"] / report["orjson_rows"]["mean_ms"], 1
+    )
+    dump(report, args.output)
+
+
+if __name__ == "__main__":
+    main()
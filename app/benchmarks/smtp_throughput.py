@@ -0,0 +1,91 @@
+"""
+Compare email throughput: connection-per-message vs. pooled vs. batched.
+
+Starts a local ``aiosmtpd`` sink (no TLS, no auth) and pushes messages
+through ``email_utils`` three ways, reporting messages per second::
+
+    pip install aiosmtpd
+    python -m benchmarks.smtp_throughput --messages 2000
+"""
+import argparse
+import os
+import smtplib
+import time
+
+from benchmarks._common import dump
+
+
+class _Sink:
+    def __init__(self):
+        self.received = 0
+
+    async def handle_DATA(self, server, session, envelope):
+        self.received += 1
+        return "250 OK"
+
+
+def _rate(count: int, elapsed: float) -> float:
+    return round(count / elapsed, 1) if elapsed else 0.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--port", type=int, default=8025)
+    parser.add_argument("--output", help="also write the JSON report here")
+    args = parser.parse_args()
+
+    # email_utils reads its settings at import time.
+    os.environ.update({
+        "SMTP_HOST": "127.0.0.1",
+        "SMTP_PORT": str(args.port),
+        "SMTP_STARTTLS": "false",
+        "SMTP_USER": "",
+        "FROM_EMAIL": "bench@example.com",
+    })
+    from aiosmtpd.controller import Controller
+
+    import email_utils
+
+    sink = _Sink()
+    controller = Controller(sink, hostname="127.0.0.1", port=args.port)
+    controller.start()
+    messages = [
+        {"to_email": f"user{i}@example.com", "subject": "bench", "body": "hello"}
+        for i in range(args.messages)
+    ]
+    try:
+        # Baseline: the previous behaviour, one connection per message.
+        start = time.perf_counter()
+        for message in messages:
+            with smtplib.SMTP("127.0.0.1", args.port) as server:
+                msg = email_utils.build_message(**message)
+                server.sendmail(email_utils.FROM_EMAIL, [message["to_email"]],
+                                msg.as_string())
+        per_connection = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for message in messages:
+            email_utils.send_email(**message)
+        pooled = time.perf_counter() - start
+
+        start = time.perf_counter()
+        email_utils.send_messages(messages)
+        batched = time.perf_counter() - start
+        connects = email_utils.get_pool().connects
+    finally:
+        email_utils.close_pool()
+        controller.stop()
+
+    dump({
+        "messages": args.messages,
+        "received": sink.received,
+        "connection_per_message_msgs_per_s": _rate(args.messages, per_connection),
+        "pooled_send_email_msgs_per_s": _rate(args.messages, pooled),
+        "batched_send_messages_msgs_per_s": _rate(args.messages, batched),
+        "pool_connects": connects,
+    }, args.output)
+
+
+if __name__ == "__main__":
+    main()
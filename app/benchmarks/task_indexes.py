@@ -0,0 +1,178 @@
+"""
+Benchmark task list/filter queries with and without the composite indexes
+declared on ``models.Task``.
+
+Seeds a synchronous SQLite (default) or Postgres stand-in, times the access
+paths used by ``GET /tasks/tasks`` and reports latency for both runs::
+
+    python -m benchmarks.task_indexes --tasks 1000000
+    python -m benchmarks.task_indexes --url postgresql://postgres:pw@localhost/bench
+
+Index regressions show up as a collapse of the ``speedup`` column.
+"""
+import argparse
+import datetime
+import random
+
+from sqlalchemy import create_engine, insert, select, text
+
+import models
+from benchmarks._common import dump, stopwatch, summarize
+
+BATCH_SIZE = 50_000
+STATUSES = list(models.TaskStatus)
+PRIORITIES = list(models.TaskPriority)
+
+
+def seed(engine, n_tasks: int, n_users: int, n_projects: int) -> None:
+    models.Base.metadata.drop_all(engine)
+    models.Base.metadata.create_all(engine)
+    rnd = random.Random(42)
+    today = datetime.date.today()
+    with engine.begin() as conn:
+        conn.execute(insert(models.User), [
+            {"email": f"user{i}@example.com", "hashed_password": "x"}
+            for i in range(n_users)
+        ])
+        conn.execute(insert(models.Project), [
+            {"name": f"project {i}", "owner_id": rnd.randint(1, n_users)}
+            for i in range(n_projects)
+        ])
+    for start in range(0, n_tasks, BATCH_SIZE):
+        rows = [
+            {
+                "title": f"task {i}",
+                "status": rnd.choice(STATUSES),
+                "priority": rnd.choice(PRIORITIES),
+                "due_date": today + datetime.timedelta(days=rnd.randint(-90, 90)),
+                "project_id": rnd.randint(1, n_projects),
+                "assignee_id": rnd.randint(1, n_users),
+            }
+            for i in range(start, min(start + BATCH_SIZE, n_tasks))
+        ]
+        with engine.begin() as conn:
+            conn.execute(insert(models.Task), rows)
+    with engine.begin() as conn:
+        if engine.dialect.name == "sqlite":
+            conn.execute(text("ANALYZE"))
+        else:
+            conn.execute(text("ANALYZE tasks"))
+
+
+def workload(n_users: int, n_projects: int, page_size: int):
+    """Yield (name, statement-factory) pairs mirroring the list endpoint."""
+    Task = models.Task
+    today = datetime.date.today()
+
+    def by_project(rnd):
+        return (
+            select(Task)
+            .where(Task.project_id == rnd.randint(1, n_projects))
+            .order_by(Task.id).limit(page_size)
+        )
+
+    def by_project_status(rnd):
+        return (
+            select(Task)
+            .where(
+                Task.project_id == rnd.randint(1, n_projects),
+                Task.status == rnd.choice(STATUSES),
+            )
+            .order_by(Task.id).limit(page_size)
+        )
+
+    def by_assignee_due(rnd):
+        start = today + datetime.timedelta(days=rnd.randint(-90, 60))
+        return (
+            select(Task)
+            .where(
+                Task.assignee_id == rnd.randint(1, n_users),
+                Task.due_date.between(start, start + datetime.timedelta(days=30)),
+            )
+            .order_by(Task.id).limit(page_size)
+        )
+
+    def by_status_due(rnd):
+        start = today + datetime.timedelta(days=rnd.randint(-90, 89))
+        return (
+            select(Task)
+            .where(
+                Task.status == rnd.choice(STATUSES),
+                Task.due_date == start,
+            )
+            .order_by(Task.id).limit(page_size)
+        )
+
+    return [
+        ("project", by_project),
+        ("project_status", by_project_status),
+        ("assignee_due_range", by_assignee_due),
+        ("status_due_date", by_status_due),
+    ]
+
+
+def run_queries(engine, queries, iterations: int) -> dict:
+    results = {}
+    with engine.connect() as conn:
+        for name, factory in queries:
+            rnd = random.Random(name)
+            samples = []
+            for _ in range(iterations):
+                stmt = factory(rnd)
+                with stopwatch(samples):
+                    conn.execute(stmt).fetchall()
+            results[name] = summarize(samples)
+    return results
+
+
+def set_indexes(engine, enabled: bool) -> None:
+    indexes = [
+        idx for idx in models.Task.__table__.indexes
+        if len(idx.columns) > 1
+    ]
+    with engine.begin() as conn:
+        for idx in indexes:
+            if enabled:
+                idx.create(conn, checkfirst=True)
+            else:
+                idx.drop(conn, checkfirst=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default="sqlite:///./bench_tasks.db",
+                        help="synchronous SQLAlchemy URL of the stand-in DB")
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=5_000)
+    parser.add_argument("--projects", type=int, default=20_000)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--skip-seed", action="store_true",
+                        help="reuse the data already in --url")
+    parser.add_argument("--output", help="also write the JSON report here")
+    args = parser.parse_args()
+
+    engine = create_engine(args.url)
+    if not args.skip_seed:
+        seed(engine, args.tasks, args.users, args.projects)
+
+    queries = workload(args.users, args.projects, args.page_size)
+    set_indexes(engine, enabled=False)
+    without = run_queries(engine, queries, args.iterations)
+    set_indexes(engine, enabled=True)
+    with_idx = run_queries(engine, queries, args.iterations)
+
+    report = {"tasks": args.tasks, "url": args.url, "queries": {}}
+    for name, _ in queries:
+        before, after = without[name], with_idx[name]
+        report["queries"][name] = {
+            "without_indexes": before,
+            "with_indexes": after,
+            "speedup": round(before["mean_ms"] / after["mean_ms"], 1)
+            if after["mean_ms"] else None,
+        }
+    dump(report, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Benchmark full-text task search against a ``LIKE '%word%'`` scan.
+
+Seeds a synthetic corpus of task titles/descriptions drawn from a Zipf-like
+vocabulary into a synchronous SQLite (FTS5) or Postgres (tsvector/GIN)
+stand-in, then times the statements built by ``search`` next to the naive
+substring scan for rare, common and multi-word queries::
+
+    python -m benchmarks.task_search --tasks 500000
+    python -m benchmarks.task_search --url postgresql://postgres:pw@localhost/bench
+"""
+import argparse
+import random
+
+from sqlalchemy import create_engine, insert, or_, select, text
+
+import models
+from benchmarks._common import dump, stopwatch, summarize
+from search import search_statement
+
+BATCH_SIZE = 20_000
+COLUMNS = (models.Task.id, models.Task.title)
+
+
+def vocabulary(size: int):
+    """Pronounceable pseudo-words; index 0 is the most frequent."""
+    rnd = random.Random(7)
+    consonants, vowels = "bcdfghklmnprstvz", "aeiou"
+    words = set()
+    while len(words) < size:
+        words.add("".join(
+            rnd.choice(consonants) + rnd.choice(vowels)
+            for _ in range(rnd.randint(2, 4))
+        ))
+    return sorted(words)
+
+
+def seed(engine, n_tasks: int, words) -> None:
+    models.Base.metadata.drop_all(engine)
+    models.Base.metadata.create_all(engine)
+    rnd = random.Random(42)
+    weights = [1 / (rank + 1) for rank in range(len(words))]
+    with engine.begin() as conn:
+        conn.execute(insert(models.User), [
+            {"email": "bench@example.com", "hashed_password": "x"}
+        ])
+        conn.execute(insert(models.Project), [
+            {"name": "bench", "owner_id": 1}
+        ])
+    for start in range(0, n_tasks, BATCH_SIZE):
+        rows = [
+            {
+                "title": " ".join(rnd.choices(words, weights, k=5)),
+                "description": " ".join(rnd.choices(words, weights, k=30)),
+                "project_id": 1,
+            }
+            for _ in range(start, min(start + BATCH_SIZE, n_tasks))
+        ]
+        with engine.begin() as conn:
+            conn.execute(insert(models.Task), rows)
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+
+
+def like_statement(query: str):
+    clauses = []
+    for word in query.split():
+        pattern = f"%{word}%"
+        clauses.append(or_(
+            models.Task.title.like(pattern),
+            models.Task.description.like(pattern),
+        ))
+    return select(*COLUMNS).where(*clauses).order_by(models.Task.id)
+
+
+def workload(words):
+    rare = words[len(words) // 2:]
+    common = words[:20]
+    return [
+        ("rare_word", lambda rnd: rnd.choice(rare)),
+        ("common_word", lambda rnd: rnd.choice(common)),
+        ("two_words", lambda rnd: f"{rnd.choice(common)} {rnd.choice(rare)}"),
+    ]
+
+
+def run_queries(engine, build, queries, iterations: int, page_size: int) -> dict:
+    results = {}
+    with engine.connect() as conn:
+        for name, pick in queries:
+            rnd = random.Random(name)
+            samples = []
+            for _ in range(iterations):
+                stmt = build(pick(rnd)).limit(page_size)
+                with stopwatch(samples):
+                    conn.execute(stmt).fetchall()
+            results[name] = summarize(samples)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default="sqlite:///./bench_search.db",
+                        help="synchronous SQLAlchemy URL of the stand-in DB")
+    parser.add_argument("--tasks", type=int, default=200_000)
+    parser.add_argument("--vocabulary", type=int, default=20_000)
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--skip-seed", action="store_true",
+                        help="reuse the data already in --url")
+    parser.add_argument("--output", help="also write the JSON report here")
+    args = parser.parse_args()
+
+    engine = create_engine(args.url)
+    words = vocabulary(args.vocabulary)
+    if not args.skip_seed:
+        seed(engine, args.tasks, words)
+
+    backend = engine.dialect.name
+    queries = workload(words)
+    indexed = run_queries(
+        engine,
+        lambda q: search_statement(COLUMNS, q, backend=backend),
+        queries, args.iterations, args.page_size,
+    )
+    scanned = run_queries(
+        engine, like_statement, queries, args.iterations, args.page_size
+    )
+
+    report = {"tasks": args.tasks, "url": args.url, "queries": {}}
+    for name, _ in queries:
+        before, after = scanned[name], indexed[name]
+        report["queries"][name] = {
+            "like_scan": before,
+            "full_text": after,
+            "speedup": round(before["mean_ms"] / after["mean_ms"], 1)
+            if after["mean_ms"] else None,
+        }
+    dump(report, args.output)
+
+
+if __name__ == "__main__":
+    main()
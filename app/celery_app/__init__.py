@@ -1,9 +1,64 @@
 from celery import Celery
+from kombu import Queue
+
+from config import get_settings
+
+settings = get_settings()
+
+# Queues split by workload so slow jobs never sit in front of e-mails:
+#   email   - short, I/O bound SMTP sends and digest flushes
+#   heavy   - long-running jobs (e.g. batched project deletion)
+#   default - everything else
+EMAIL_QUEUE = "email"
+HEAVY_QUEUE = "heavy"
+DEFAULT_QUEUE = "default"
 
 celery = Celery(
-    "tasks",
-    broker="redis://redis:6379/0",
-    backend="redis://redis:6379/0"
+    "tms",
+    broker=settings.CELERY_BROKER_URL,
+    backend=settings.CELERY_RESULT_BACKEND,
+)
+
+celery.conf.update(
+    task_queues=(
+        Queue(DEFAULT_QUEUE),
+        Queue(EMAIL_QUEUE),
+        Queue(HEAVY_QUEUE),
+    ),
+    task_default_queue=DEFAULT_QUEUE,
+    task_routes={
+        "celery_app.tasks.send_email_task": {"queue": EMAIL_QUEUE},
+        "celery_app.tasks.send_email_batch_task": {"queue": EMAIL_QUEUE},
+        "celery_app.tasks.flush_notification_digests": {"queue": EMAIL_QUEUE},
+        "celery_app.tasks.delete_project_task": {"queue": HEAVY_QUEUE},
+    },
+    worker_prefetch_multiplier=settings.CELERY_PREFETCH_MULTIPLIER,
+    task_acks_late=settings.CELERY_ACKS_LATE,
+    # With late acks, re-queue tasks whose worker process died mid-run.
+    task_reject_on_worker_lost=settings.CELERY_ACKS_LATE,
+    task_compression=settings.CELERY_TASK_COMPRESSION or None,
+    result_expires=settings.CELERY_RESULT_EXPIRES,
+    task_serializer="json",
+    result_serializer="json",
+    accept_content=["json"],
 )
 
 celery.autodiscover_tasks(['celery_app'])
+
+celery.conf.beat_schedule = {
+    "flush-notification-digests": {
+        "task": "celery_app.tasks.flush_notification_digests",
+        "schedule": float(settings.NOTIFY_FLUSH_INTERVAL_SECONDS),
+    },
+    "relay-outbox": {
+        "task": "celery_app.tasks.relay_outbox",
+        "schedule": settings.OUTBOX_RELAY_INTERVAL_SECONDS,
+        # A missed run is superseded by the next one.
+        "options": {"expires": settings.OUTBOX_RELAY_INTERVAL_SECONDS * 5},
+    },
+    "send-due-date-reminders": {
+        "task": "celery_app.tasks.send_due_date_reminders",
+        "schedule": settings.REMINDER_INTERVAL_SECONDS,
+        "options": {"expires": settings.REMINDER_INTERVAL_SECONDS},
+    },
+}
@@ -1,9 +1,5 @@
-from celery import Celery
-import os
+# Entry point for ``celery -A celery_app.celery``; the application itself is
+# configured once, from config.Settings, in celery_app/__init__.py.
+from celery_app import celery as app
 
-REDIS_URL = os.getenv("REDIS_URL", "redis://redis:6379/0")
-
-app = Celery("tms")
-app.conf.broker_url = REDIS_URL
-app.conf.result_backend = REDIS_URL
-app.autodiscover_tasks(["app.celery_app", "app.api"])
+__all__ = ["app"]
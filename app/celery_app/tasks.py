@@ -1,11 +1,26 @@
 # app/celery_app/tasks.py
 
+import asyncio
+
 from celery import shared_task
+from celery.signals import worker_process_shutdown
+import redis
 import models
 import schemas
-from email_utils import send_email  # adjust if located elsewhere
+from config import get_settings
+from notifications import (
+    ack_digest,
+    claim_due_digests,
+    relay_batch,
+    release_digest,
+)
+from project_cache import project_cache
+from email_utils import close_pool, deliver, send_email  # adjust if located elsewhere
 
-@shared_task
+EMAIL_MAX_RETRIES = 5
+
+
+@shared_task(ignore_result=True)
 def send_email_task(to_email: str, subject: str, body: str):
     """
     Background task to send an email.
@@ -19,6 +34,167 @@ def send_email_task(to_email: str, subject: str, body: str):
     return f"Email sent to {to_email} with subject '{subject}'"
 
 
+class EmailDeliveryError(Exception):
+    """Some messages could not be handed to the SMTP server; retry later."""
+
+
+@shared_task(
+    bind=True,
+    ignore_result=True,
+    max_retries=EMAIL_MAX_RETRIES,
+    retry_backoff=True,
+)
+def send_email_batch_task(self, messages: list):
+    """
+    Send several emails over a single pooled SMTP connection.
+    Each message is a dict with to_email, subject and body. Messages that
+    were never sent because the connection failed are retried; messages
+    the server refused are not.
+    """
+    outcomes = deliver(messages)
+    unsent = [m for m, outcome in zip(messages, outcomes) if outcome is None]
+    if unsent:
+        raise self.retry(
+            args=[unsent],
+            exc=EmailDeliveryError(f"{len(unsent)} emails not sent"),
+        )
+    sent = sum(1 for outcome in outcomes if outcome)
+    return f"Sent {sent} of {len(messages)} emails"
+
+
+@shared_task(
+    bind=True,
+    ignore_result=True,
+    max_retries=EMAIL_MAX_RETRIES,
+    retry_backoff=True,
+)
+def flush_notification_digests(self):
+    """
+    Periodic task: send one digest email per recipient whose buffered
+    notifications have waited for the full coalescing window.
+
+    Buffered events are removed only after their digest was accepted (or
+    permanently refused) by the SMTP server. Digests that could not be
+    sent are released back to the buffer and the task retries.
+    """
+    client = redis.Redis.from_url(get_settings().REDIS_URL, decode_responses=True)
+    try:
+        claims = claim_due_digests(client)
+        if not claims:
+            return "No digests due"
+        outcomes = deliver([claim.message for claim in claims])
+        unsent = 0
+        for claim, outcome in zip(claims, outcomes):
+            if outcome is None:
+                release_digest(client, claim)
+                unsent += 1
+            else:
+                ack_digest(client, claim)
+    finally:
+        client.close()
+    if unsent:
+        raise self.retry(
+            exc=EmailDeliveryError(f"{unsent} of {len(claims)} digests not sent")
+        )
+    return f"Sent {len(claims)} digests"
+
+
+def _run_async(coro):
+    """
+    Run a coroutine from a (synchronous) task. Pooled async DB connections
+    are bound to the event loop, so the engine is disposed before the loop
+    closes.
+    """
+    from database import engine
+
+    async def runner():
+        try:
+            return await coro
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(runner())
+
+
+@shared_task(ignore_result=True)
+def relay_outbox():
+    """
+    Periodic task: drain the transactional outbox in batches and hand the
+    events on (digest buffer or e-mail queue). Events are deleted only
+    after a successful hand-off, giving at-least-once delivery.
+    """
+    from database import async_session_factory
+
+    settings = get_settings()
+    client = redis.Redis.from_url(settings.REDIS_URL, decode_responses=True)
+
+    async def drain():
+        relayed = 0
+        for _ in range(settings.OUTBOX_RELAY_MAX_BATCHES):
+            async with async_session_factory() as session:
+                count = await relay_batch(
+                    session, client, settings.OUTBOX_RELAY_BATCH_SIZE
+                )
+            relayed += count
+            if count < settings.OUTBOX_RELAY_BATCH_SIZE:
+                break
+        return relayed
+
+    try:
+        relayed = _run_async(drain())
+    finally:
+        client.close()
+    return f"Relayed {relayed} outbox events"
+
+
+@shared_task(ignore_result=True)
+def send_due_date_reminders():
+    """
+    Periodic task: remind assignees of tasks due soon or overdue. Scans
+    resume from their watermarks; see ``reminders``.
+    """
+    from database import async_session_factory
+    from reminders import send_reminders
+
+    reminded = _run_async(send_reminders(async_session_factory))
+    return f"Reminded about {reminded} tasks"
+
+
+@shared_task(bind=True)
+def delete_project_task(self, project_id: int, owner_id: int):
+    """
+    Delete a large project in batches, reporting PROGRESS with
+    {"deleted": n, "total": m} as task meta.
+    """
+    from project_deletion import delete_project_in_batches
+
+    def report(deleted, total):
+        self.update_state(
+            state="PROGRESS",
+            meta={"project_id": project_id, "owner_id": owner_id,
+                  "deleted": deleted, "total": total},
+        )
+
+    deleted = _run_async(delete_project_in_batches(project_id, on_progress=report))
+
+    client = redis.Redis.from_url(get_settings().REDIS_URL, decode_responses=True)
+    try:
+        client.delete(
+            project_cache.list_key(owner_id),
+            project_cache.item_key(owner_id, project_id),
+        )
+    finally:
+        client.close()
+    return {"project_id": project_id, "owner_id": owner_id,
+            "deleted": deleted, "total": deleted}
+
+
+@worker_process_shutdown.connect
+def _close_smtp_pool(**kwargs):
+    """Close pooled SMTP connections when a worker process exits."""
+    close_pool()
+
+
 # Example: another task (optional)
 @shared_task
 def example_task(data: dict):
@@ -11,9 +11,167 @@ class Settings:
         "DATABASE_URL", "sqlite+aiosqlite:///./tms.db"
     )
     REDIS_URL: str = os.getenv("REDIS_URL", "redis://redis:6379/0")
+    # Redis sits on the request path (caches, token denylist), so calls
+    # must fail fast; after a connection failure it is skipped for
+    # REDIS_RETRY_SECONDS (redis_client.redis_available)
+    REDIS_CONNECT_TIMEOUT_SECONDS: float = float(
+        os.getenv("REDIS_CONNECT_TIMEOUT_SECONDS", "0.25")
+    )
+    REDIS_TIMEOUT_SECONDS: float = float(
+        os.getenv("REDIS_TIMEOUT_SECONDS", "0.25")
+    )
+    REDIS_RETRY_SECONDS: float = float(os.getenv("REDIS_RETRY_SECONDS", "5"))
+
+    # Celery (celery_app/__init__.py)
+    CELERY_BROKER_URL: str = os.getenv("CELERY_BROKER_URL") or REDIS_URL
+    CELERY_RESULT_BACKEND: str = os.getenv("CELERY_RESULT_BACKEND") or REDIS_URL
+    CELERY_PREFETCH_MULTIPLIER: int = int(
+        os.getenv("CELERY_PREFETCH_MULTIPLIER", "4")
+    )
+    CELERY_ACKS_LATE: bool = (
+        os.getenv("CELERY_ACKS_LATE", "true").lower() == "true"
+    )
+    # e.g. "gzip"; empty disables message compression
+    CELERY_TASK_COMPRESSION: str = os.getenv("CELERY_TASK_COMPRESSION", "")
+    CELERY_RESULT_EXPIRES: int = int(os.getenv("CELERY_RESULT_EXPIRES", "3600"))
+
+    # Database connection pool (ignored for SQLite)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING: bool = (
+        os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    )
+
+    # Refuse to start unless the database is at database.SCHEMA_REVISION
+    DB_SCHEMA_CHECK: bool = (
+        os.getenv("DB_SCHEMA_CHECK", "true").lower() == "true"
+    )
+
     SENDGRID_API_KEY: str = os.getenv("SENDGRID_API_KEY", "changeme")
     EMAIL_FROM: str = os.getenv("EMAIL_FROM", "noreply@example.com")
 
+    # Authenticated-user cache (auth.user_cache)
+    USER_CACHE_MAX_SIZE: int = int(os.getenv("USER_CACHE_MAX_SIZE", "10000"))
+    USER_CACHE_TTL_SECONDS: int = int(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+    USER_CACHE_REDIS_ENABLED: bool = (
+        os.getenv("USER_CACHE_REDIS_ENABLED", "false").lower() == "true"
+    )
+
+    # Verified-token cache and stateless auth (security.py, auth/deps.py)
+    TOKEN_CACHE_MAX_SIZE: int = int(os.getenv("TOKEN_CACHE_MAX_SIZE", "50000"))
+    JWT_EMBED_USER_CLAIMS: bool = (
+        os.getenv("JWT_EMBED_USER_CLAIMS", "false").lower() == "true"
+    )
+    JWT_DENYLIST_ENABLED: bool = (
+        os.getenv("JWT_DENYLIST_ENABLED", "true").lower() == "true"
+    )
+
+    # Rate limiting and load shedding (auth/middleware.RateLimitMiddleware);
+    # rates are tokens per second, bursts the bucket capacity
+    # Off by default: behind a proxy every client shares the proxy's IP
+    # unless RATE_LIMIT_TRUST_FORWARDED is set (see README, Deployment).
+    RATE_LIMIT_ENABLED: bool = (
+        os.getenv("RATE_LIMIT_ENABLED", "false").lower() == "true"
+    )
+    RATE_LIMIT_REDIS_ENABLED: bool = (
+        os.getenv("RATE_LIMIT_REDIS_ENABLED", "true").lower() == "true"
+    )
+    RATE_LIMIT_USER_RATE: float = float(os.getenv("RATE_LIMIT_USER_RATE", "20"))
+    RATE_LIMIT_USER_BURST: int = int(os.getenv("RATE_LIMIT_USER_BURST", "40"))
+    # Requests without a token; most of the task API is served anonymously,
+    # so this is sized like the per-user bucket, not as an abuse trap.
+    RATE_LIMIT_IP_RATE: float = float(os.getenv("RATE_LIMIT_IP_RATE", "20"))
+    RATE_LIMIT_IP_BURST: int = int(os.getenv("RATE_LIMIT_IP_BURST", "40"))
+    # /auth/login and /auth/register, per client IP
+    RATE_LIMIT_AUTH_RATE: float = float(os.getenv("RATE_LIMIT_AUTH_RATE", "0.2"))
+    RATE_LIMIT_AUTH_BURST: int = int(os.getenv("RATE_LIMIT_AUTH_BURST", "5"))
+    # Use the first X-Forwarded-For hop as client IP (behind a trusted proxy)
+    RATE_LIMIT_TRUST_FORWARDED: bool = (
+        os.getenv("RATE_LIMIT_TRUST_FORWARDED", "false").lower() == "true"
+    )
+    # Requests served at once per worker before shedding with 503; 0 = off
+    MAX_CONCURRENT_REQUESTS: int = int(
+        os.getenv("MAX_CONCURRENT_REQUESTS", "64")
+    )
+
+    # Password hashing executor (security.hash_password_async)
+    PASSWORD_HASH_EXECUTOR: str = os.getenv("PASSWORD_HASH_EXECUTOR", "thread")
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", "4"))
+    PASSWORD_HASH_MAX_PENDING: int = int(
+        os.getenv("PASSWORD_HASH_MAX_PENDING", "64")
+    )
+
+    # Project read-through cache (project_cache.py)
+    PROJECT_CACHE_ENABLED: bool = (
+        os.getenv("PROJECT_CACHE_ENABLED", "true").lower() == "true"
+    )
+    PROJECT_CACHE_TTL_SECONDS: int = int(
+        os.getenv("PROJECT_CACHE_TTL_SECONDS", "300")
+    )
+
+    # Project deletion (project_deletion.py)
+    PROJECT_DELETE_ASYNC_THRESHOLD: int = int(
+        os.getenv("PROJECT_DELETE_ASYNC_THRESHOLD", "10000")
+    )
+    PROJECT_DELETE_BATCH_SIZE: int = int(
+        os.getenv("PROJECT_DELETE_BATCH_SIZE", "5000")
+    )
+    # How long a background deletion's owner is kept for progress polling
+    PROJECT_DELETE_JOB_TTL_SECONDS: int = int(
+        os.getenv("PROJECT_DELETE_JOB_TTL_SECONDS", "86400")
+    )
+
+    # Notification digests (notifications.py)
+    NOTIFY_DIGEST_ENABLED: bool = (
+        os.getenv("NOTIFY_DIGEST_ENABLED", "true").lower() == "true"
+    )
+    NOTIFY_DIGEST_WINDOW_SECONDS: int = int(
+        os.getenv("NOTIFY_DIGEST_WINDOW_SECONDS", "60")
+    )
+    NOTIFY_FLUSH_INTERVAL_SECONDS: int = int(
+        os.getenv("NOTIFY_FLUSH_INTERVAL_SECONDS", "30")
+    )
+    NOTIFY_FLUSH_BATCH_SIZE: int = int(
+        os.getenv("NOTIFY_FLUSH_BATCH_SIZE", "500")
+    )
+    # A claimed digest not acked or released by then is flushed again
+    NOTIFY_DIGEST_LEASE_SECONDS: int = int(
+        os.getenv("NOTIFY_DIGEST_LEASE_SECONDS", "300")
+    )
+
+    # Transactional outbox relay (notifications.relay_batch)
+    OUTBOX_RELAY_INTERVAL_SECONDS: float = float(
+        os.getenv("OUTBOX_RELAY_INTERVAL_SECONDS", "2")
+    )
+    OUTBOX_RELAY_BATCH_SIZE: int = int(
+        os.getenv("OUTBOX_RELAY_BATCH_SIZE", "500")
+    )
+    OUTBOX_RELAY_MAX_BATCHES: int = int(
+        os.getenv("OUTBOX_RELAY_MAX_BATCHES", "20")
+    )
+
+    # Due-date reminders (reminders.py)
+    REMINDER_INTERVAL_SECONDS: float = float(
+        os.getenv("REMINDER_INTERVAL_SECONDS", "900")
+    )
+    REMINDER_DUE_SOON_DAYS: int = int(os.getenv("REMINDER_DUE_SOON_DAYS", "1"))
+    # Overdue tasks older than this are never reminded about
+    REMINDER_OVERDUE_DAYS: int = int(os.getenv("REMINDER_OVERDUE_DAYS", "7"))
+    REMINDER_BATCH_SIZE: int = int(os.getenv("REMINDER_BATCH_SIZE", "1000"))
+    REMINDER_MAX_BATCHES: int = int(os.getenv("REMINDER_MAX_BATCHES", "50"))
+
+    # Live task events over SSE (events.py)
+    EVENTS_ENABLED: bool = (
+        os.getenv("EVENTS_ENABLED", "true").lower() == "true"
+    )
+    EVENTS_QUEUE_SIZE: int = int(os.getenv("EVENTS_QUEUE_SIZE", "100"))
+    EVENTS_MAX_OVERFLOWS: int = int(os.getenv("EVENTS_MAX_OVERFLOWS", "3"))
+    EVENTS_HEARTBEAT_SECONDS: float = float(
+        os.getenv("EVENTS_HEARTBEAT_SECONDS", "15")
+    )
+
 
 class Config:
     env_file = ".env"
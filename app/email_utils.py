@@ -1,25 +1,209 @@
 # app/services/email.py
 import os
 import smtplib
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
 from email.mime.text import MIMEText
+from typing import Iterable, List, Mapping, Optional, Sequence
 
 SMTP_HOST = os.getenv("SMTP_HOST")
 SMTP_PORT = int(os.getenv("SMTP_PORT", 587))
 SMTP_USER = os.getenv("SMTP_USER")
 SMTP_PASS = os.getenv("SMTP_PASS")
+SMTP_STARTTLS = os.getenv("SMTP_STARTTLS", "true").lower() == "true"
+SMTP_TIMEOUT = float(os.getenv("SMTP_TIMEOUT", 30))
+SMTP_POOL_SIZE = int(os.getenv("SMTP_POOL_SIZE", 2))
+SMTP_MAX_IDLE_SECONDS = float(os.getenv("SMTP_MAX_IDLE_SECONDS", 60))
 FROM_EMAIL = os.getenv("FROM_EMAIL")
 
-def send_email(to_email: str, subject: str, body: str):
+
+class SMTPConnectionPool:
+    """
+    Per-process pool of authenticated SMTP connections.
+
+    Connections are reused across messages instead of paying for the TCP
+    handshake, STARTTLS and AUTH on every send. An idle connection is
+    health-checked with NOOP before reuse and replaced if it is stale or
+    dead. The pool is tied to the process that created it, so a forked
+    Celery worker child never shares a socket with its parent.
+    """
+
+    def __init__(
+        self,
+        host: str = None,
+        port: int = None,
+        user: str = None,
+        password: str = None,
+        starttls: bool = None,
+        size: int = None,
+        max_idle: float = None,
+        timeout: float = None,
+    ):
+        self.host = host or SMTP_HOST
+        self.port = port or SMTP_PORT
+        self.user = user if user is not None else SMTP_USER
+        self.password = password if password is not None else SMTP_PASS
+        self.starttls = SMTP_STARTTLS if starttls is None else starttls
+        self.size = SMTP_POOL_SIZE if size is None else size
+        self.max_idle = SMTP_MAX_IDLE_SECONDS if max_idle is None else max_idle
+        self.timeout = timeout or SMTP_TIMEOUT
+        self.pid = os.getpid()
+        self._idle = deque()
+        self._lock = threading.Lock()
+        self.connects = 0
+
+    def _connect(self) -> smtplib.SMTP:
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.starttls:
+                server.starttls()
+            if self.user:
+                server.login(self.user, self.password)
+        except Exception:
+            _quietly_close(server)
+            raise
+        self.connects += 1
+        return server
+
+    def _is_healthy(self, server: smtplib.SMTP, last_used: float) -> bool:
+        if time.monotonic() - last_used > self.max_idle:
+            return False
+        try:
+            return server.noop()[0] == 250
+        except OSError:  # smtplib.SMTPException derives from OSError
+            return False
+
+    def acquire(self) -> smtplib.SMTP:
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                server, last_used = self._idle.pop()
+            if self._is_healthy(server, last_used):
+                return server
+            _quietly_close(server)
+        return self._connect()
+
+    def release(self, server: smtplib.SMTP) -> None:
+        with self._lock:
+            if len(self._idle) < self.size:
+                self._idle.append((server, time.monotonic()))
+                return
+        _quietly_close(server)
+
+    def discard(self, server: smtplib.SMTP) -> None:
+        _quietly_close(server)
+
+    @contextmanager
+    def connection(self):
+        """
+        Borrow a connection; it is returned only if the block succeeds and
+        dropped on any exception, since its protocol state is unknown.
+        """
+        server = self.acquire()
+        try:
+            yield server
+        except BaseException:
+            self.discard(server)
+            raise
+        else:
+            self.release(server)
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = list(self._idle), deque()
+        for server, _ in idle:
+            _quietly_close(server)
+
+
+def _quietly_close(server: smtplib.SMTP) -> None:
+    try:
+        server.quit()
+    except Exception:
+        server.close()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> SMTPConnectionPool:
+    """Return this process's SMTP pool, creating a fresh one after a fork."""
+    global _pool
+    with _pool_lock:
+        if _pool is None or _pool.pid != os.getpid():
+            _pool = SMTPConnectionPool()
+        return _pool
+
+
+def close_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None and _pool.pid == os.getpid():
+            _pool.close()
+        _pool = None
+
+
+def build_message(to_email: str, subject: str, body: str) -> MIMEText:
     msg = MIMEText(body, "plain")
     msg["Subject"] = subject
     msg["From"] = FROM_EMAIL
     msg["To"] = to_email
+    return msg
 
-    try:
-        with smtplib.SMTP(SMTP_HOST, SMTP_PORT) as server:
-            server.starttls()
-            server.login(SMTP_USER, SMTP_PASS)
-            server.sendmail(FROM_EMAIL, [to_email], msg.as_string())
-        print(f"✅ Email sent to {to_email}")
-    except Exception as e:
-        print(f"❌ Error sending email: {e}")
+
+def _deliver(server: smtplib.SMTP, message: Mapping) -> None:
+    msg = build_message(message["to_email"], message["subject"], message["body"])
+    server.sendmail(FROM_EMAIL, [message["to_email"]], msg.as_string())
+
+
+def deliver(messages: Sequence[Mapping]) -> List[Optional[bool]]:
+    """
+    Send ``messages`` (dicts with to_email/subject/body) over one pooled
+    connection and report the outcome of each: True if the server accepted
+    it, False if it refused it (permanent, retrying will not help), None if
+    it was never sent because the connection failed (transient).
+
+    A dropped connection is re-established once and the interrupted message
+    retried.
+    """
+    pool = get_pool()
+    outcomes: List[Optional[bool]] = [None] * len(messages)
+    position = 0
+    reconnected = False
+    while position < len(messages):
+        try:
+            with pool.connection() as server:
+                while position < len(messages):
+                    message = messages[position]
+                    try:
+                        _deliver(server, message)
+                        outcomes[position] = True
+                        reconnected = False
+                        print(f"✅ Email sent to {message['to_email']}")
+                    except (smtplib.SMTPRecipientsRefused,
+                            smtplib.SMTPDataError,
+                            smtplib.SMTPSenderRefused) as e:
+                        outcomes[position] = False
+                        print(f"❌ Error sending email to {message['to_email']}: {e}")
+                    position += 1
+        except OSError as e:
+            if reconnected:
+                print(f"❌ Error sending email: {e}")
+                break
+            reconnected = True
+        except Exception as e:
+            print(f"❌ Error sending email: {e}")
+            break
+    return outcomes
+
+
+def send_messages(messages: Iterable[Mapping]) -> int:
+    """Send ``messages`` (see ``deliver``) and return how many were accepted."""
+    return sum(1 for outcome in deliver(list(messages)) if outcome)
+
+
+def send_email(to_email: str, subject: str, body: str):
+    send_messages([{"to_email": to_email, "subject": subject, "body": body}])
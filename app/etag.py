@@ -0,0 +1,32 @@
+"""Weak ETag helpers for conditional GETs (``If-None-Match`` -> 304)."""
+import hashlib
+
+from fastapi import Request, Response, status
+
+
+def weak_etag(*parts) -> str:
+    """Build a weak ETag from the row identities/versions behind a response."""
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """True if the client's ``If-None-Match`` already names ``etag``."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    current = _opaque(etag)
+    return any(_opaque(tag) == current for tag in header.split(","))
+
+
+def not_modified(etag: str) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+    )
@@ -0,0 +1,234 @@
+"""
+Live task events per project, pushed to clients over Server-Sent Events.
+
+Task writes publish a small JSON event to the Redis channel
+``project:{id}:tasks`` once their transaction has committed (``publish``).
+Every worker holds a single pattern subscription for all project channels
+(``EventHub``) and fans each event out to the bounded queues of the SSE
+connections it serves for that project, so the number of Redis connections
+does not grow with the number of clients.
+
+Backpressure: a client that does not drain its queue fast enough has the
+queued events dropped and replaced by one ``{"type": "resync"}`` event,
+telling it to refetch the task list. A client that overflows more than
+``EVENTS_MAX_OVERFLOWS`` times in a row is disconnected. The same resync
+is sent to everyone after the Redis subscription had to be re-established,
+since events may have been missed meanwhile.
+
+Event payloads carry ``type`` (``task.created``, ``task.updated`` - an
+upsert, with the full ``task`` or only the ``changes`` of a bulk update -
+or ``task.deleted``), ``project_id`` and ``task_id``.
+"""
+import asyncio
+import logging
+from collections import defaultdict
+from typing import AsyncIterator, Dict, Iterable, Optional, Set, Tuple
+
+from config import get_settings
+from responses import dumps
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+CHANNEL = "project:{project_id}:tasks"
+CHANNEL_PATTERN = "project:*:tasks"
+
+RESYNC = dumps({"type": "resync"}).decode()
+RETRY_MS = 3000
+_CLOSE = object()
+
+# Keep fire-and-forget publish tasks referenced until they finish.
+_pending_publishes: Set[asyncio.Task] = set()
+
+
+def channel(project_id: int) -> str:
+    return CHANNEL.format(project_id=project_id)
+
+
+def task_event(kind: str, project_id: int, task_id: int, **fields) -> Tuple[int, dict]:
+    """A ``(project_id, event)`` pair for ``publish``."""
+    event = {"type": f"task.{kind}", "project_id": project_id, "task_id": task_id}
+    event.update(fields)
+    return project_id, event
+
+
+async def _publish(events) -> None:
+    from redis_client import get_redis, record_failure, redis_available
+
+    if not redis_available():
+        return
+    try:
+        async with get_redis().pipeline(transaction=False) as pipe:
+            for project_id, event in events:
+                pipe.publish(channel(project_id), dumps(event))
+            await pipe.execute()
+    except Exception as exc:
+        record_failure(exc)
+        logger.warning("Publishing %d task events failed: %s", len(events), exc)
+
+
+def publish(events: Iterable[Tuple[int, dict]]) -> None:
+    """
+    Publish task events in the background; call only after commit.
+
+    The request does not wait for Redis and a failure is only logged:
+    live updates are best-effort, the database stays the source of truth.
+    """
+    events = list(events)
+    if not events or not settings.EVENTS_ENABLED:
+        return
+    task = asyncio.get_running_loop().create_task(_publish(events))
+    _pending_publishes.add(task)
+    task.add_done_callback(_pending_publishes.discard)
+
+
+class Subscriber:
+    """One SSE connection's bounded queue of serialized events."""
+
+    def __init__(self, project_id: int, queue_size: int, max_overflows: int):
+        self.project_id = project_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.max_overflows = max_overflows
+        self.overflows = 0
+
+    def offer(self, data) -> bool:
+        """Queue ``data``; on overflow replace the backlog with a resync."""
+        try:
+            self.queue.put_nowait(data)
+            return True
+        except asyncio.QueueFull:
+            pass
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.overflows += 1
+        self.queue.put_nowait(
+            _CLOSE if self.overflows > self.max_overflows else RESYNC
+        )
+        return False
+
+    async def get(self, timeout: float):
+        data = await asyncio.wait_for(self.queue.get(), timeout)
+        if data is not RESYNC and data is not _CLOSE:
+            self.overflows = 0
+        return data
+
+
+class EventHub:
+    """Per-worker fan-out of the project channels to local SSE clients."""
+
+    def __init__(self, queue_size: int, max_overflows: int, heartbeat: float):
+        self.queue_size = queue_size
+        self.max_overflows = max_overflows
+        self.heartbeat = heartbeat
+        self._subscribers: Dict[int, Set[Subscriber]] = defaultdict(set)
+        self._listener: Optional[asyncio.Task] = None
+        self.received = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.reconnects = 0
+
+    def subscribe(self, project_id: int) -> Subscriber:
+        subscriber = Subscriber(project_id, self.queue_size, self.max_overflows)
+        self._subscribers[project_id].add(subscriber)
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.get_running_loop().create_task(self._listen())
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        subscribers = self._subscribers.get(subscriber.project_id)
+        if subscribers is not None:
+            subscribers.discard(subscriber)
+            if not subscribers:
+                del self._subscribers[subscriber.project_id]
+
+    def _fan_out(self, project_id: int, data: str) -> None:
+        self.received += 1
+        for subscriber in list(self._subscribers.get(project_id, ())):
+            if subscriber.offer(data):
+                self.delivered += 1
+            else:
+                self.dropped += 1
+
+    def _resync_all(self) -> None:
+        for subscribers in list(self._subscribers.values()):
+            for subscriber in list(subscribers):
+                subscriber.offer(RESYNC)
+
+    async def _listen(self) -> None:
+        # Its own client: the subscription blocks on reads indefinitely.
+        from redis_client import get_pubsub_redis
+
+        backoff = 0.5
+        while True:
+            pubsub = get_pubsub_redis().pubsub()
+            try:
+                await pubsub.psubscribe(CHANNEL_PATTERN)
+                backoff = 0.5
+                async for message in pubsub.listen():
+                    if message["type"] != "pmessage":
+                        continue
+                    try:
+                        project_id = int(message["channel"].split(":")[1])
+                    except (IndexError, ValueError):
+                        continue
+                    self._fan_out(project_id, message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Task event subscription lost: %s", exc)
+            finally:
+                try:
+                    await pubsub.close()
+                except Exception:
+                    pass
+            self.reconnects += 1
+            self._resync_all()
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30)
+
+    async def stream(self, project_id: int, request) -> AsyncIterator[str]:
+        """SSE frames for one client until it disconnects or falls behind."""
+        subscriber = self.subscribe(project_id)
+        try:
+            yield f"retry: {RETRY_MS}\n\n"
+            while True:
+                try:
+                    data = await subscriber.get(self.heartbeat)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield ": keep-alive\n\n"
+                    continue
+                if data is _CLOSE:
+                    yield f"data: {RESYNC}\n\n"
+                    break
+                yield f"data: {data}\n\n"
+        finally:
+            self.unsubscribe(subscriber)
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._listener = None
+
+    def stats(self) -> dict:
+        return {
+            "projects": len(self._subscribers),
+            "subscribers": sum(len(s) for s in self._subscribers.values()),
+            "received": self.received,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "reconnects": self.reconnects,
+        }
+
+
+event_hub = EventHub(
+    queue_size=settings.EVENTS_QUEUE_SIZE,
+    max_overflows=settings.EVENTS_MAX_OVERFLOWS,
+    heartbeat=settings.EVENTS_HEARTBEAT_SECONDS,
+)
@@ -0,0 +1,76 @@
+"""
+Streaming exports.
+
+Rows are read through a server-side cursor (``AsyncSession.stream``) and
+encoded a partition at a time, so memory stays flat however many rows are
+exported.
+"""
+import csv
+import enum
+import io
+from datetime import date, datetime
+from typing import AsyncIterator, List
+
+from fastapi.responses import StreamingResponse
+
+from database import async_session_factory
+from responses import dumps
+
+EXPORT_PARTITION_SIZE = 1000
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _plain(value):
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _encode_ndjson(rows) -> bytes:
+    return b"".join(dumps(dict(row)) + b"\n" for row in rows)
+
+
+def _encode_csv(rows, columns: List[str]) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows([_plain(row[column]) for column in columns] for row in rows)
+    return buffer.getvalue()
+
+
+async def stream_rows(statement, fmt: str) -> AsyncIterator:
+    """
+    Yield ``statement``'s rows encoded as NDJSON or CSV, one chunk per
+    partition. The generator owns its session because it outlives the
+    request-scoped one.
+    """
+    columns = [column.name for column in statement.selected_columns]
+    if fmt == "csv":
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow(columns)
+        yield buffer.getvalue()
+
+    async with async_session_factory() as session:
+        result = await session.stream(
+            statement.execution_options(yield_per=EXPORT_PARTITION_SIZE)
+        )
+        async for partition in result.mappings().partitions():
+            if fmt == "csv":
+                yield _encode_csv(partition, columns)
+            else:
+                yield _encode_ndjson(partition)
+
+
+def export_response(statement, fmt: str, filename: str) -> StreamingResponse:
+    return StreamingResponse(
+        stream_rows(statement, fmt),
+        media_type=MEDIA_TYPES[fmt],
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}.{fmt}"'
+        },
+    )
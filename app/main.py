@@ -1,19 +1,34 @@
 from fastapi import FastAPI
-from models import Base
-from database import engine
+from config import get_settings
+from database import check_schema_revision, engine
+from events import event_hub
+from metrics import install_query_hooks
+from auth.middleware import MetricsMiddleware, RateLimitMiddleware
 from api.projects import router as projects_router
 from api.tasks import router as tasks_router
+from api.metrics import router as metrics_router
 from auth.auth import router as auth_router
 
 app = FastAPI()
+# Added first so it runs inside MetricsMiddleware and rejections are counted.
+app.add_middleware(RateLimitMiddleware)
+app.add_middleware(MetricsMiddleware)
+install_query_hooks(engine)
 
 @app.on_event("startup")
 async def on_startup():
-    # Create tables using the async engine
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    # The schema is owned by the migrations (alembic upgrade head); workers
+    # only check that the database is at the expected revision.
+    if get_settings().DB_SCHEMA_CHECK:
+        await check_schema_revision()
+
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    await event_hub.close()
 
 # Include routers
 app.include_router(auth_router, prefix="/auth", tags=["auth"])
 app.include_router(projects_router, prefix="/projects", tags=["projects"])
 app.include_router(tasks_router, prefix="/tasks", tags=["tasks"])
+app.include_router(metrics_router, prefix="/metrics", tags=["metrics"])
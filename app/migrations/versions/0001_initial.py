@@ -0,0 +1,86 @@
+"""Initial schema
+
+Users, projects and tasks as the application first created them with
+``Base.metadata.create_all``, before the schema was managed by migrations.
+
+A database created that way already has these tables. This revision then
+adopts it as-is instead of failing on "table already exists", so
+``alembic upgrade head`` brings old and new databases to the same schema.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+TASK_STATUSES = ("todo", "in_progress", "done")
+TASK_PRIORITIES = ("low", "medium", "high")
+
+
+def upgrade() -> None:
+    if sa.inspect(op.get_bind()).has_table("users"):
+        # Created by create_all before migrations existed: adopt it.
+        return
+
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("hashed_password", sa.String(), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    op.create_table(
+        "projects",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column(
+            "owner_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False
+        ),
+    )
+    op.create_index("ix_projects_id", "projects", ["id"])
+
+    op.create_table(
+        "tasks",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("description", sa.String(), nullable=True),
+        sa.Column(
+            "status", sa.Enum(*TASK_STATUSES, name="taskstatus"), nullable=False
+        ),
+        sa.Column(
+            "priority",
+            sa.Enum(*TASK_PRIORITIES, name="taskpriority"),
+            nullable=False,
+        ),
+        sa.Column("due_date", sa.Date(), nullable=True),
+        sa.Column(
+            "project_id",
+            sa.Integer(),
+            sa.ForeignKey("projects.id"),
+            nullable=False,
+        ),
+        sa.Column(
+            "assignee_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=True
+        ),
+    )
+    op.create_index("ix_tasks_id", "tasks", ["id"])
+
+
+def downgrade() -> None:
+    op.drop_table("tasks")
+    op.drop_table("projects")
+    op.drop_table("users")
+
+    if op.get_bind().dialect.name == "postgresql":
+        sa.Enum(name="taskpriority").drop(op.get_bind(), checkfirst=True)
+        sa.Enum(name="taskstatus").drop(op.get_bind(), checkfirst=True)
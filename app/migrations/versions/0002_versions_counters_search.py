@@ -0,0 +1,167 @@
+"""Row versions, cascading task deletes, counters, outbox and search
+
+Brings the initial schema up to what the API needs:
+
+* ``version`` columns on projects and tasks (ETags, optimistic updates);
+* ``tasks.project_id`` recreated with ``ON DELETE CASCADE`` so deleting a
+  project removes its tasks in the database;
+* composite task indexes for the list, filter and assignee queries;
+* ``project_task_counts``, backfilled from the existing tasks;
+* ``outbox_events`` for notifications written with the task change;
+* full-text search: a GIN index on Postgres, an FTS5 table with its sync
+  triggers on SQLite, rebuilt from the existing tasks.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+TASK_STATUSES = ("todo", "in_progress", "done")
+TASK_PRIORITIES = ("low", "medium", "high")
+
+# Both types already exist: 0001 created them with the tasks table.
+task_status = postgresql.ENUM(*TASK_STATUSES, name="taskstatus", create_type=False)
+task_priority = postgresql.ENUM(
+    *TASK_PRIORITIES, name="taskpriority", create_type=False
+)
+
+# create_all left the constraint unnamed; Postgres calls it this, SQLite
+# gets the name from the naming convention while the table is recreated.
+PROJECT_FK = {"postgresql": "tasks_project_id_fkey"}
+SQLITE_NAMING = {"fk": "fk_%(table_name)s_%(column_0_name)s"}
+
+TASK_SEARCH_VECTOR = (
+    "to_tsvector('english'::regconfig, "
+    "title || ' ' || coalesce(description, ''))"
+)
+
+TASK_FTS_DDL = (
+    "CREATE VIRTUAL TABLE tasks_fts USING fts5("
+    "title, description, content='tasks', content_rowid='id')",
+    "CREATE TRIGGER tasks_fts_ai AFTER INSERT ON tasks BEGIN "
+    "INSERT INTO tasks_fts(rowid, title, description) "
+    "VALUES (new.id, new.title, new.description); END",
+    "CREATE TRIGGER tasks_fts_ad AFTER DELETE ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); END",
+    "CREATE TRIGGER tasks_fts_au "
+    "AFTER UPDATE OF title, description ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); "
+    "INSERT INTO tasks_fts(rowid, title, description) "
+    "VALUES (new.id, new.title, new.description); END",
+    # Index the tasks that existed before the triggers.
+    "INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')",
+)
+
+COUNTER_BACKFILL = (
+    "INSERT INTO project_task_counts (project_id, status, priority, count) "
+    "SELECT project_id, status, priority, count(*) FROM tasks "
+    "GROUP BY project_id, status, priority"
+)
+
+
+def _version_column() -> sa.Column:
+    return sa.Column("version", sa.Integer(), nullable=False, server_default="1")
+
+
+def _alter_tasks(dialect: str):
+    """Batch context for ``tasks``; SQLite has to copy the table."""
+    if dialect == "sqlite":
+        return op.batch_alter_table(
+            "tasks", recreate="always", naming_convention=SQLITE_NAMING
+        )
+    return op.batch_alter_table("tasks")
+
+
+def _project_fk(dialect: str) -> str:
+    return PROJECT_FK.get(dialect, "fk_tasks_project_id")
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+
+    op.add_column("projects", _version_column())
+    with _alter_tasks(dialect) as batch:
+        batch.add_column(_version_column())
+        batch.drop_constraint(_project_fk(dialect), type_="foreignkey")
+        batch.create_foreign_key(
+            _project_fk(dialect), "projects", ["project_id"], ["id"],
+            ondelete="CASCADE",
+        )
+
+    op.create_index("ix_tasks_project_id_status", "tasks", ["project_id", "status"])
+    op.create_index(
+        "ix_tasks_assignee_id_due_date", "tasks", ["assignee_id", "due_date"]
+    )
+    op.create_index("ix_tasks_status_due_date", "tasks", ["status", "due_date"])
+
+    op.create_table(
+        "project_task_counts",
+        sa.Column(
+            "project_id",
+            sa.Integer(),
+            sa.ForeignKey("projects.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("status", task_status, primary_key=True),
+        sa.Column("priority", task_priority, primary_key=True),
+        sa.Column("count", sa.Integer(), nullable=False),
+    )
+    op.execute(COUNTER_BACKFILL)
+
+    op.create_table(
+        "outbox_events",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("kind", sa.String(), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+    )
+
+    if dialect == "postgresql":
+        op.create_index(
+            "ix_tasks_search",
+            "tasks",
+            [sa.text(TASK_SEARCH_VECTOR)],
+            postgresql_using="gin",
+        )
+    elif dialect == "sqlite":
+        for statement in TASK_FTS_DDL:
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        for name in ("tasks_fts_au", "tasks_fts_ad", "tasks_fts_ai"):
+            op.execute(f"DROP TRIGGER IF EXISTS {name}")
+        op.execute("DROP TABLE IF EXISTS tasks_fts")
+    elif dialect == "postgresql":
+        op.drop_index("ix_tasks_search", table_name="tasks")
+
+    op.drop_table("outbox_events")
+    op.drop_table("project_task_counts")
+    op.drop_index("ix_tasks_status_due_date", table_name="tasks")
+    op.drop_index("ix_tasks_assignee_id_due_date", table_name="tasks")
+    op.drop_index("ix_tasks_project_id_status", table_name="tasks")
+
+    with _alter_tasks(dialect) as batch:
+        batch.drop_constraint(_project_fk(dialect), type_="foreignkey")
+        batch.create_foreign_key(
+            _project_fk(dialect), "projects", ["project_id"], ["id"]
+        )
+        batch.drop_column("version")
+    op.drop_column("projects", "version")
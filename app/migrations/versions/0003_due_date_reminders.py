@@ -0,0 +1,46 @@
+"""Due-date reminders
+
+Index for the reminder job's (due_date, id) keyset scan and the table
+holding each scan's watermark.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+"""
+import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_tasks_due_date_id", "tasks", ["due_date", "id"])
+
+    watermarks = op.create_table(
+        "reminder_watermarks",
+        sa.Column("name", sa.String(), primary_key=True),
+        sa.Column("due_date", sa.Date(), nullable=False),
+        sa.Column("task_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+    )
+    # Pre-created so concurrent first runs serialize on the row lock; the
+    # scans' lookback bound moves them forward on the first run.
+    op.bulk_insert(watermarks, [
+        {"name": name, "due_date": datetime.date(1970, 1, 1), "task_id": 0}
+        for name in ("due_soon", "overdue")
+    ])
+
+
+def downgrade() -> None:
+    op.drop_table("reminder_watermarks")
+    op.drop_index("ix_tasks_due_date_id", table_name="tasks")
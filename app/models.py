@@ -1,5 +1,6 @@
 import enum
 from sqlalchemy import (
+    DDL,
     Column,
     Integer,
     String,
@@ -7,7 +8,13 @@ from sqlalchemy import (
     ForeignKey,
     Text,
     Enum,
-    Date
+    Date,
+    DateTime,
+    Index,
+    JSON,
+    event,
+    func,
+    literal_column
 )
 from sqlalchemy.orm import relationship
 from database import Base
@@ -25,6 +32,19 @@ class TaskPriority(str, enum.Enum):
     high = "high"
 
 
+def version_column():
+    """
+    Row version bumped by every UPDATE; responses derive their ETag from it.
+    """
+    return Column(
+        Integer,
+        nullable=False,
+        default=1,
+        server_default="1",
+        onupdate=literal_column("version + 1")
+    )
+
+
 class User(Base):
     __tablename__ = "users"
 
@@ -80,20 +100,36 @@ class Project(Base):
         ForeignKey("users.id"),
         nullable=False
     )
+    version = version_column()
 
     owner = relationship(
         "User",
         back_populates="projects"
     )
+    # Tasks are removed by the database (ON DELETE CASCADE); the ORM must
+    # not load them one by one when a project is deleted. Never lazy-loaded:
+    # readers select tasks explicitly (paginated) instead.
     tasks = relationship(
         "Task",
         back_populates="project",
-        cascade="all, delete"
+        cascade="all, delete",
+        passive_deletes=True,
+        lazy="raise"
     )
 
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Composite indexes for the task access paths: tasks of a project
+        # (optionally by status), an assignee's tasks ordered by due date,
+        # status/due-date range scans and the reminder job's keyset scan
+        # over (due_date, id).
+        Index("ix_tasks_project_id_status", "project_id", "status"),
+        Index("ix_tasks_assignee_id_due_date", "assignee_id", "due_date"),
+        Index("ix_tasks_status_due_date", "status", "due_date"),
+        Index("ix_tasks_due_date_id", "due_date", "id"),
+    )
 
     id = Column(
         Integer,
@@ -124,7 +160,7 @@ class Task(Base):
     )
     project_id = Column(
         Integer,
-        ForeignKey("projects.id"),
+        ForeignKey("projects.id", ondelete="CASCADE"),
         nullable=False
     )
     assignee_id = Column(
@@ -132,13 +168,161 @@ class Task(Base):
         ForeignKey("users.id"),
         nullable=True
     )
+    version = version_column()
 
     project = relationship(
         "Project",
         back_populates="tasks"
     )
+    # Load with selectinload() when needed; a lazy load per task is an N+1.
     assignee = relationship(
         "User",
-        back_populates="tasks"
+        back_populates="tasks",
+        lazy="raise"
+    )
+
+
+# Full-text search over task titles and descriptions (see ``search``).
+#
+# Postgres indexes the tsvector expression below with GIN; queries must use
+# the very same expression for the planner to pick the index, so both go
+# through ``task_search_vector``. The text search configuration is inlined
+# as a literal: a bound parameter would not match the index expression.
+TASK_SEARCH_CONFIG = literal_column("'english'::regconfig")
+
+
+def task_search_vector(columns=None):
+    """``to_tsvector`` over title and description of the ``tasks`` table."""
+    columns = Task.__table__.c if columns is None else columns
+    document = columns.title.op("||")(literal_column("' '")).op("||")(
+        func.coalesce(columns.description, literal_column("''"))
+    )
+    return func.to_tsvector(TASK_SEARCH_CONFIG, document)
+
+
+Index(
+    "ix_tasks_search",
+    task_search_vector(),
+    postgresql_using="gin",
+).ddl_if(dialect="postgresql")
+
+# SQLite: an external-content FTS5 table kept in sync with ``tasks`` by
+# triggers. Only the inverted index is stored; the text stays in ``tasks``.
+TASK_FTS_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5("
+    "title, description, content='tasks', content_rowid='id')",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_ai AFTER INSERT ON tasks BEGIN "
+    "INSERT INTO tasks_fts(rowid, title, description) "
+    "VALUES (new.id, new.title, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_ad AFTER DELETE ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_au "
+    "AFTER UPDATE OF title, description ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); "
+    "INSERT INTO tasks_fts(rowid, title, description) "
+    "VALUES (new.id, new.title, new.description); END",
+)
+TASK_FTS_DROP_DDL = (
+    "DROP TRIGGER IF EXISTS tasks_fts_au",
+    "DROP TRIGGER IF EXISTS tasks_fts_ad",
+    "DROP TRIGGER IF EXISTS tasks_fts_ai",
+    "DROP TABLE IF EXISTS tasks_fts",
+)
+
+for _statement in TASK_FTS_DDL:
+    event.listen(
+        Task.__table__, "after_create",
+        DDL(_statement).execute_if(dialect="sqlite"),
+    )
+for _statement in TASK_FTS_DROP_DDL:
+    event.listen(
+        Task.__table__, "before_drop",
+        DDL(_statement).execute_if(dialect="sqlite"),
+    )
+
+
+class ProjectTaskCount(Base):
+    """
+    Denormalized number of tasks per (project, status, priority).
+
+    Maintained in the same transaction as every task write (see
+    ``task_stats``) so dashboards never need a GROUP BY over ``tasks``.
+    """
+    __tablename__ = "project_task_counts"
+
+    project_id = Column(
+        Integer,
+        ForeignKey("projects.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    status = Column(
+        Enum(TaskStatus),
+        primary_key=True
+    )
+    priority = Column(
+        Enum(TaskPriority),
+        primary_key=True
+    )
+    count = Column(
+        Integer,
+        nullable=False,
+        default=0
+    )
+
+
+class OutboxEvent(Base):
+    """
+    Transactional outbox: side effects (e-mails) written in the same
+    transaction as the change that caused them and relayed to Celery by
+    ``celery_app.tasks.relay_outbox``. Rows are deleted once relayed.
+    """
+    __tablename__ = "outbox_events"
+
+    id = Column(
+        Integer,
+        primary_key=True
+    )
+    kind = Column(
+        String,
+        nullable=False
+    )
+    payload = Column(
+        JSON,
+        nullable=False
     )
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
+
+
+class ReminderWatermark(Base):
+    """
+    Position of a due-date reminder scan (see ``reminders``): the
+    ``(due_date, task_id)`` of the last task reminded. Advanced in the same
+    transaction that records the reminders, so a restart neither rescans
+    nor sends twice.
+    """
+    __tablename__ = "reminder_watermarks"
 
+    name = Column(
+        String,
+        primary_key=True
+    )
+    due_date = Column(
+        Date,
+        nullable=False
+    )
+    task_id = Column(
+        Integer,
+        nullable=False
+    )
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False
+    )
@@ -0,0 +1,201 @@
+"""
+Task notifications: transactional outbox, relay and digest coalescing.
+
+Request handlers only *record* notifications (``record``/``record_many``)
+as ``OutboxEvent`` rows in the transaction that changes the task, so the
+API never waits on the broker and no event is lost if the broker is down
+at commit time. ``celery_app.tasks.relay_outbox`` drains the outbox in
+batches (``relay_batch``) and hands the messages on with at-least-once
+semantics: rows are deleted only after a successful hand-off.
+
+Handed-on messages are buffered per recipient in Redis instead of being
+sent one e-mail at a time. A periodic Celery task
+(``flush_notification_digests``) claims every recipient whose oldest
+buffered event is older than ``NOTIFY_DIGEST_WINDOW_SECONDS`` and sends them
+a single digest, all digests of one run sharing one pooled SMTP connection.
+Buffered events are only removed once their digest has been accepted by
+the SMTP server; undelivered digests stay buffered for the next attempt.
+
+Redis layout:
+
+* ``notify:pending:<email>`` - list of JSON events waiting for that recipient
+* ``notify:due`` - sorted set of recipients scored by their oldest event time
+"""
+import json
+import time
+from typing import List, NamedTuple, Optional
+
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from config import get_settings
+from models import OutboxEvent
+
+EMAIL_EVENT = "email"
+
+PENDING_KEY = "notify:pending:{}"
+DUE_KEY = "notify:due"
+
+settings = get_settings()
+
+
+def record(session: AsyncSession, to_email: str, subject: str, body: str) -> None:
+    """Add an e-mail notification to the session's transaction."""
+    session.add(OutboxEvent(
+        kind=EMAIL_EVENT,
+        payload={"to_email": to_email, "subject": subject, "body": body},
+    ))
+
+
+def record_many(session: AsyncSession, messages: List[dict]) -> None:
+    """Add several notifications (dicts with to_email/subject/body)."""
+    session.add_all(
+        OutboxEvent(kind=EMAIL_EVENT, payload=message) for message in messages
+    )
+
+
+def _event(subject: str, body: str) -> str:
+    return json.dumps({"subject": subject, "body": body, "ts": time.time()})
+
+
+def dispatch(messages: List[dict], redis) -> None:
+    """
+    Hand relayed messages on: into the per-recipient digest buffer, or with
+    coalescing disabled, to the e-mail queue as one batch. ``redis`` is a
+    synchronous client. Raises if the hand-off fails.
+    """
+    if not messages:
+        return
+    if not settings.NOTIFY_DIGEST_ENABLED:
+        from celery_app.tasks import send_email_batch_task
+        send_email_batch_task.delay(messages)
+        return
+    now = time.time()
+    pipe = redis.pipeline(transaction=True)
+    for message in messages:
+        to_email = message["to_email"]
+        pipe.rpush(
+            PENDING_KEY.format(to_email),
+            _event(message["subject"], message["body"]),
+        )
+        pipe.zadd(DUE_KEY, {to_email: now}, nx=True)
+    pipe.execute()
+
+
+async def relay_batch(session: AsyncSession, redis, batch_size: int) -> int:
+    """
+    Move up to ``batch_size`` outbox events on and delete them, in one
+    transaction. Concurrent relays skip each other's locked rows. Returns
+    the number of events relayed.
+    """
+    result = await session.execute(
+        select(OutboxEvent)
+        .order_by(OutboxEvent.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    events = result.scalars().all()
+    if not events:
+        await session.rollback()
+        return 0
+    dispatch(
+        [event.payload for event in events if event.kind == EMAIL_EVENT], redis
+    )
+    await session.execute(
+        delete(OutboxEvent)
+        .where(OutboxEvent.id.in_([event.id for event in events]))
+        .execution_options(synchronize_session=False)
+    )
+    await session.commit()
+    return len(events)
+
+
+def build_digest(to_email: str, events: List[dict]) -> dict:
+    """Fold buffered events for one recipient into a single message."""
+    if len(events) == 1:
+        subject, body = events[0]["subject"], events[0]["body"]
+    else:
+        subject = f"{len(events)} task updates"
+        body = "\n\n".join(
+            f"{event['subject']}\n{event['body']}" for event in events
+        )
+    return {"to_email": to_email, "subject": subject, "body": body}
+
+
+class DigestClaim(NamedTuple):
+    to_email: str
+    score: float      # due score before the claim, restored on release
+    events: int       # number of buffered events folded into ``message``
+    message: dict
+
+
+# Claim every due recipient by pushing its score past the lease, so that
+# concurrent or overlapping flushes never pick up the same recipient.
+_CLAIM_LUA = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], 0, ARGV[1],
+                       'WITHSCORES', 'LIMIT', 0, ARGV[2])
+for i = 1, #due, 2 do
+    redis.call('ZADD', KEYS[1], 'XX', ARGV[3], due[i])
+end
+return due
+"""
+
+# Drop the first ARGV[1] events (the ones delivered); events buffered since
+# the claim stay and the recipient becomes due again after a fresh window.
+_ACK_LUA = """
+redis.call('LTRIM', KEYS[1], ARGV[1], -1)
+if redis.call('LLEN', KEYS[1]) == 0 then
+    redis.call('ZREM', KEYS[2], ARGV[2])
+else
+    redis.call('ZADD', KEYS[2], 'XX', ARGV[3], ARGV[2])
+end
+"""
+
+
+def claim_due_digests(redis, now: Optional[float] = None) -> List[DigestClaim]:
+    """
+    Claim every recipient whose digest window has elapsed and return one
+    digest per recipient. Nothing is removed yet: each claim must be
+    ``ack_digest``-ed after delivery or ``release_digest``-d on failure.
+    A claim that is neither (worker crash) expires after
+    ``NOTIFY_DIGEST_LEASE_SECONDS``. ``redis`` is a synchronous client
+    (this runs inside the Celery worker).
+    """
+    now = time.time() if now is None else now
+    cutoff = now - settings.NOTIFY_DIGEST_WINDOW_SECONDS
+    lease = cutoff + settings.NOTIFY_DIGEST_LEASE_SECONDS
+    due = redis.eval(
+        _CLAIM_LUA, 1, DUE_KEY, cutoff, settings.NOTIFY_FLUSH_BATCH_SIZE, lease
+    )
+    recipients = list(zip(due[::2], (float(score) for score in due[1::2])))
+    if not recipients:
+        return []
+
+    pipe = redis.pipeline(transaction=False)
+    for to_email, _ in recipients:
+        pipe.lrange(PENDING_KEY.format(to_email), 0, -1)
+    claims = []
+    for (to_email, score), raw_events in zip(recipients, pipe.execute()):
+        if not raw_events:
+            redis.zrem(DUE_KEY, to_email)
+            continue
+        events = [json.loads(raw) for raw in raw_events]
+        claims.append(DigestClaim(
+            to_email, score, len(events), build_digest(to_email, events)
+        ))
+    return claims
+
+
+def ack_digest(redis, claim: DigestClaim, now: Optional[float] = None) -> None:
+    """Remove the delivered events of ``claim`` from the buffer."""
+    now = time.time() if now is None else now
+    redis.eval(
+        _ACK_LUA, 2, PENDING_KEY.format(claim.to_email), DUE_KEY,
+        claim.events, claim.to_email, now,
+    )
+
+
+def release_digest(redis, claim: DigestClaim) -> None:
+    """Give an undelivered claim back, due again at its original score."""
+    redis.zadd(DUE_KEY, {claim.to_email: claim.score}, xx=True)
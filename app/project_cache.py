@@ -0,0 +1,133 @@
+"""
+Read-through Redis cache for project reads.
+
+Entries hold the response's ETag and the already-serialized ``ProjectRead``
+JSON (see ``pack``), so a hit - or a 304 - is answered without touching
+Postgres or Pydantic. Writers invalidate the owner's list and the affected
+project after committing.
+"""
+import asyncio
+import logging
+import weakref
+from typing import Awaitable, Callable, Optional
+
+from config import get_settings
+from redis_client import record_failure, redis_available
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+
+def pack(etag: str, body: str) -> str:
+    """Store ETag and body as one value; JSON bodies contain no raw newline."""
+    return f"{etag}\n{body}"
+
+
+def unpack(value: str) -> tuple:
+    etag, _, body = value.partition("\n")
+    return etag, body
+
+
+class ProjectCache:
+    LIST_KEY = "projects:owner:{owner_id}:list"
+    ITEM_KEY = "projects:owner:{owner_id}:item:{project_id}"
+
+    def __init__(self, ttl: int, enabled: bool = True):
+        self.ttl = ttl
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        # One lock per cold key so only one request rebuilds it.
+        self._locks = weakref.WeakValueDictionary()
+
+    def _redis(self):
+        from redis_client import get_redis
+        return get_redis()
+
+    def list_key(self, owner_id: int) -> str:
+        return self.LIST_KEY.format(owner_id=owner_id)
+
+    def item_key(self, owner_id: int, project_id: int) -> str:
+        return self.ITEM_KEY.format(owner_id=owner_id, project_id=project_id)
+
+    async def _get(self, key: str) -> Optional[str]:
+        if not redis_available():
+            return None
+        try:
+            return await self._redis().get(key)
+        except Exception as exc:
+            self.errors += 1
+            record_failure(exc)
+            logger.warning("Project cache read failed: %s", exc)
+            return None
+
+    async def _set(self, key: str, body: str) -> None:
+        if not redis_available():
+            return
+        try:
+            await self._redis().set(key, body, ex=self.ttl)
+        except Exception as exc:
+            self.errors += 1
+            record_failure(exc)
+            logger.warning("Project cache write failed: %s", exc)
+
+    async def get_or_load(
+        self, key: str, loader: Callable[[], Awaitable[Optional[str]]]
+    ) -> Optional[str]:
+        """
+        Return the cached value for ``key``, calling ``loader`` on a miss.
+        ``loader`` returns the packed value, or None if there is nothing
+        to cache (e.g. the project does not exist).
+        """
+        if not self.enabled:
+            return await loader()
+
+        body = await self._get(key)
+        if body is not None:
+            self.hits += 1
+            return body
+
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        async with lock:
+            # Another request may have rebuilt the key while we waited.
+            body = await self._get(key)
+            if body is not None:
+                self.hits += 1
+                return body
+            self.misses += 1
+            body = await loader()
+            if body is not None:
+                await self._set(key, body)
+            return body
+
+    async def invalidate(self, owner_id: int, project_id: int = None) -> None:
+        if not self.enabled:
+            return
+        keys = [self.list_key(owner_id)]
+        if project_id is not None:
+            keys.append(self.item_key(owner_id, project_id))
+        try:
+            await self._redis().delete(*keys)
+        except Exception as exc:
+            self.errors += 1
+            record_failure(exc)
+            logger.warning("Project cache invalidation failed: %s", exc)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+project_cache = ProjectCache(
+    ttl=settings.PROJECT_CACHE_TTL_SECONDS,
+    enabled=settings.PROJECT_CACHE_ENABLED,
+)
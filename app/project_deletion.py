@@ -0,0 +1,107 @@
+"""
+Set-based project deletion.
+
+Small projects are deleted inline with three statements. Projects with more
+than ``PROJECT_DELETE_ASYNC_THRESHOLD`` tasks are handed to the
+``delete_project_task`` Celery task, which removes their tasks in short
+batches (one transaction each) and reports progress, so no request or
+transaction has to hold locks on every task row at once.
+
+The owner of each background deletion is recorded in Redis under its job
+id before the job is queued, and progress is only reported to that owner.
+"""
+from typing import Callable, Optional
+
+from sqlalchemy import delete, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from config import get_settings
+from models import Project, ProjectTaskCount, Task
+from task_stats import TaskCountDeltas, apply_deltas
+
+settings = get_settings()
+
+JOB_OWNER_KEY = "projects:deletion:{}:owner"
+
+
+async def remember_job_owner(redis, job_id: str, owner_id: int) -> None:
+    await redis.set(
+        JOB_OWNER_KEY.format(job_id), owner_id,
+        ex=settings.PROJECT_DELETE_JOB_TTL_SECONDS,
+    )
+
+
+async def job_owner(redis, job_id: str) -> Optional[int]:
+    """The user who started deletion ``job_id``, or None if unknown."""
+    owner_id = await redis.get(JOB_OWNER_KEY.format(job_id))
+    return int(owner_id) if owner_id is not None else None
+
+
+async def count_tasks(session: AsyncSession, project_id: int) -> int:
+    result = await session.execute(
+        select(func.count()).where(Task.project_id == project_id)
+    )
+    return result.scalar_one()
+
+
+async def delete_project_rows(session: AsyncSession, project_id: int) -> None:
+    """Delete a project and everything under it without loading any rows."""
+    for statement in (
+        delete(Task).where(Task.project_id == project_id),
+        delete(ProjectTaskCount).where(ProjectTaskCount.project_id == project_id),
+        delete(Project).where(Project.id == project_id),
+    ):
+        await session.execute(
+            statement.execution_options(synchronize_session=False)
+        )
+
+
+async def delete_project_in_batches(
+    project_id: int,
+    batch_size: int = None,
+    on_progress: Optional[Callable[[int, int], None]] = None,
+) -> int:
+    """
+    Delete a large project's tasks ``batch_size`` at a time, then the
+    project itself. Returns the tasks deleted.
+
+    Each batch's counter deltas are applied in the batch's own transaction,
+    so ``project_task_counts`` matches the remaining tasks after every
+    commit, as it does for the synchronous deletes.
+    """
+    from database import async_session_factory
+
+    batch_size = batch_size or settings.PROJECT_DELETE_BATCH_SIZE
+    async with async_session_factory() as session:
+        total = await count_tasks(session, project_id)
+        deleted = 0
+        if on_progress:
+            on_progress(deleted, total)
+        while True:
+            batch = (
+                select(Task.id)
+                .where(Task.project_id == project_id)
+                .limit(batch_size)
+                .scalar_subquery()
+            )
+            result = await session.execute(
+                delete(Task)
+                .where(Task.id.in_(batch))
+                .returning(Task.status, Task.priority)
+                .execution_options(synchronize_session=False)
+            )
+            rows = result.all()
+            deltas = TaskCountDeltas()
+            for status, priority in rows:
+                deltas.add(project_id, status, priority, amount=-1)
+            await apply_deltas(session, deltas)
+            await session.commit()
+            if not rows:
+                break
+            deleted += len(rows)
+            if on_progress:
+                on_progress(deleted, total)
+        await delete_project_rows(session, project_id)
+        await session.commit()
+    return deleted
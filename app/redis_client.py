@@ -0,0 +1,67 @@
+import logging
+import time
+from functools import lru_cache
+
+import redis.asyncio as aioredis
+from redis.exceptions import ConnectionError, TimeoutError
+
+from config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# monotonic time until which fail-open callers skip Redis
+_down_until = 0.0
+
+
+@lru_cache()
+def get_redis() -> aioredis.Redis:
+    """
+    Return the process-wide asyncio Redis client for ``Settings.REDIS_URL``.
+
+    The client keeps its own connection pool, so it is created lazily once
+    and shared by every request handled in this worker. Connects and reads
+    time out after a fraction of a second: an unreachable Redis must not
+    stall the requests that only use it as a cache.
+    """
+    settings = get_settings()
+    return aioredis.from_url(
+        settings.REDIS_URL,
+        decode_responses=True,
+        socket_connect_timeout=settings.REDIS_CONNECT_TIMEOUT_SECONDS,
+        socket_timeout=settings.REDIS_TIMEOUT_SECONDS,
+    )
+
+
+@lru_cache()
+def get_pubsub_redis() -> aioredis.Redis:
+    """
+    Client for long-lived subscriptions: same connect timeout, but no read
+    timeout, since a subscriber blocks on reads until a message arrives.
+    """
+    settings = get_settings()
+    return aioredis.from_url(
+        settings.REDIS_URL,
+        decode_responses=True,
+        socket_connect_timeout=settings.REDIS_CONNECT_TIMEOUT_SECONDS,
+    )
+
+
+def redis_available() -> bool:
+    """False while backing off after a connection failure."""
+    return time.monotonic() >= _down_until
+
+
+def record_failure(exc: Exception) -> None:
+    """
+    Note a failed Redis call. Connection failures and timeouts make
+    ``redis_available`` false for ``REDIS_RETRY_SECONDS``, so fail-open
+    callers stop paying the timeout on every request.
+    """
+    global _down_until
+    if isinstance(exc, (ConnectionError, TimeoutError, OSError)):
+        if redis_available():
+            logger.warning(
+                "Redis unreachable, skipping it for %ss: %s",
+                get_settings().REDIS_RETRY_SECONDS, exc,
+            )
+        _down_until = time.monotonic() + get_settings().REDIS_RETRY_SECONDS
@@ -0,0 +1,138 @@
+"""
+Due-date reminders.
+
+``celery_app.tasks.send_due_date_reminders`` runs two scans, each over the
+``ix_tasks_due_date_id`` index in ``(due_date, id)`` keyset order:
+
+* ``due_soon`` - open tasks due between today and
+  ``REMINDER_DUE_SOON_DAYS`` from now;
+* ``overdue`` - open tasks whose due date has passed, looking back at most
+  ``REMINDER_OVERDUE_DAYS`` days.
+
+Every batch is one short transaction: lock the scan's ``ReminderWatermark``,
+read the next ``REMINDER_BATCH_SIZE`` tasks after it, record one reminder
+per assignee in the notification outbox and move the watermark to the last
+task read. Reminders and watermark commit together, so a crashed or
+restarted run resumes where the last commit left off without re-sending,
+and no query ever spans more than one batch.
+
+Each task is reminded at most once per scan, when the scan's upper bound
+(which moves with the calendar) passes its due date. A task created or
+rescheduled behind a watermark is not picked up by that scan again.
+"""
+import datetime
+from collections import defaultdict
+from typing import Dict, List, NamedTuple, Optional
+
+from sqlalchemy import tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from config import get_settings
+from models import ReminderWatermark, Task, TaskStatus, User
+from notifications import record_many
+
+OPEN_STATUSES = (TaskStatus.todo, TaskStatus.in_progress)
+
+
+class Scan(NamedTuple):
+    name: str
+    lower: datetime.date   # earliest due date considered
+    upper: datetime.date   # latest due date considered
+    subject: str
+
+
+def scans(today: datetime.date, settings=None) -> List[Scan]:
+    settings = settings or get_settings()
+    return [
+        Scan(
+            "due_soon",
+            today,
+            today + datetime.timedelta(days=settings.REMINDER_DUE_SOON_DAYS),
+            "Tasks due soon",
+        ),
+        Scan(
+            "overdue",
+            today - datetime.timedelta(days=settings.REMINDER_OVERDUE_DAYS),
+            today - datetime.timedelta(days=1),
+            "Overdue tasks",
+        ),
+    ]
+
+
+def build_reminder(to_email: str, subject: str, tasks: List) -> dict:
+    lines = [f"- {task.title} (due {task.due_date.isoformat()})" for task in tasks]
+    return {"to_email": to_email, "subject": subject, "body": "\n".join(lines)}
+
+
+async def _watermark(session: AsyncSession, scan: Scan) -> ReminderWatermark:
+    """Load and lock the scan's watermark, creating it on the first run."""
+    watermark = await session.get(
+        ReminderWatermark, scan.name, with_for_update=True
+    )
+    if watermark is None:
+        watermark = ReminderWatermark(
+            name=scan.name, due_date=scan.lower, task_id=0
+        )
+        session.add(watermark)
+    return watermark
+
+
+async def remind_batch(session: AsyncSession, scan: Scan, batch_size: int) -> int:
+    """
+    Record reminders for the next batch of ``scan`` and advance its
+    watermark, in one transaction. Returns the number of tasks read.
+    """
+    watermark = await _watermark(session, scan)
+    # The lookback bound wins over a watermark left behind by a long pause.
+    start = max((watermark.due_date, watermark.task_id), (scan.lower, 0))
+
+    result = await session.execute(
+        select(Task.id, Task.title, Task.due_date, User.email)
+        .join(User, User.id == Task.assignee_id)
+        .where(
+            tuple_(Task.due_date, Task.id) > start,
+            Task.due_date <= scan.upper,
+            Task.status.in_(OPEN_STATUSES),
+        )
+        .order_by(Task.due_date, Task.id)
+        .limit(batch_size)
+    )
+    rows = result.all()
+    if not rows:
+        await session.rollback()
+        return 0
+
+    by_assignee: Dict[str, list] = defaultdict(list)
+    for row in rows:
+        by_assignee[row.email].append(row)
+    record_many(session, [
+        build_reminder(email, scan.subject, tasks)
+        for email, tasks in by_assignee.items()
+    ])
+
+    last = rows[-1]
+    watermark.due_date, watermark.task_id = last.due_date, last.id
+    await session.commit()
+    return len(rows)
+
+
+async def send_reminders(
+    session_factory, today: Optional[datetime.date] = None
+) -> Dict[str, int]:
+    """Run every scan for up to ``REMINDER_MAX_BATCHES`` batches each."""
+    settings = get_settings()
+    today = today or datetime.date.today()
+    reminded = {}
+    for scan in scans(today, settings):
+        total = 0
+        for _ in range(settings.REMINDER_MAX_BATCHES):
+            async with session_factory() as session:
+                count = await remind_batch(
+                    session, scan, settings.REMINDER_BATCH_SIZE
+                )
+            total += count
+            if count < settings.REMINDER_BATCH_SIZE:
+                break
+        reminded[scan.name] = total
+    return reminded
@@ -0,0 +1,32 @@
+"""
+Lean JSON responses for read-heavy list endpoints.
+
+List handlers select plain column rows and return them through
+``FastJSONResponse`` instead of letting FastAPI validate and re-serialize
+every ORM object against the ``response_model``. The model is still
+declared on the route for the OpenAPI schema; the row shape must match it.
+"""
+from typing import Any, Iterable, List
+
+import orjson
+from fastapi.responses import JSONResponse
+
+# Columns/attributes are emitted as-is: orjson encodes enums by value and
+# dates/datetimes as ISO 8601, matching the Pydantic output.
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, option=ORJSON_OPTIONS)
+
+
+def rows_to_dicts(rows: Iterable) -> List[dict]:
+    """Turn ``Result.mappings()`` rows into plain dicts for orjson."""
+    return [dict(row) for row in rows]
+
+
+class FastJSONResponse(JSONResponse):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
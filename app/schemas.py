@@ -1,6 +1,6 @@
 from datetime import date
 from pydantic import BaseModel, EmailStr, ConfigDict
-from typing import Optional
+from typing import Dict, List, Optional
 
 # --- User Schemas ---
 
@@ -30,6 +30,13 @@ class ProjectRead(ProjectBase):
     id: int
     owner_id: int
 
+class ProjectStats(BaseModel):
+    """Task counts of one project, by status and by priority."""
+    project_id: int
+    total: int
+    by_status: Dict[str, int]
+    by_priority: Dict[str, int]
+
 
 # --- Task Schemas ---
 
@@ -60,3 +67,54 @@ class TaskUpdate(BaseModel):
     project_id: Optional[int] = None
     assignee_id: Optional[int] = None
     model_config = ConfigDict(from_attributes=True)
+
+class TaskPage(BaseModel):
+    """A page of tasks plus the cursor for the next page (None on the last)."""
+    items: List[TaskRead]
+    next_cursor: Optional[int] = None
+
+
+class TaskSearchHit(TaskRead):
+    """A search result; higher ``rank`` means a better match."""
+    rank: float
+
+
+class TaskSearchPage(BaseModel):
+    """A page of search results plus the offset of the next page."""
+    items: List[TaskSearchHit]
+    next_offset: Optional[int] = None
+
+
+# --- Project board ---
+
+class AssigneeSummary(BaseModel):
+    id: int
+    email: EmailStr
+    model_config = ConfigDict(from_attributes=True)
+
+class ProjectBoard(BaseModel):
+    """
+    A project with one page of its tasks and the users assigned to them.
+    Pass ``next_cursor`` as ``after_id`` for the next page of tasks.
+    """
+    project: ProjectRead
+    tasks: List[TaskRead]
+    assignees: List[AssigneeSummary]
+    next_cursor: Optional[int] = None
+
+
+# --- Bulk Task Schemas ---
+
+class TaskBulkUpdateItem(TaskUpdate):
+    id: int
+
+class TaskBulkDelete(BaseModel):
+    ids: List[int]
+
+class TaskBulkResult(BaseModel):
+    """Outcome of one item of a bulk request, in request order."""
+    index: int
+    ok: bool
+    id: Optional[int] = None
+    error: Optional[str] = None
+    task: Optional[TaskRead] = None
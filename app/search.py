@@ -0,0 +1,97 @@
+"""
+Full-text task search.
+
+Two indexed backends, picked from the database URL:
+
+* ``postgresql``: the GIN index on ``models.task_search_vector()``, queried
+  with ``websearch_to_tsquery`` and ranked with ``ts_rank_cd``.
+* ``sqlite``: the ``tasks_fts`` FTS5 table, ranked with ``bm25``.
+
+Both return the same columns plus a ``rank`` where higher is better, ordered
+by rank and then id so that offset pagination is stable.
+"""
+import re
+from typing import Optional
+
+from sqlalchemy import column, func, literal_column, table
+from sqlalchemy.engine import make_url
+from sqlalchemy.future import select
+
+import models
+from config import get_settings
+
+SUPPORTED_BACKENDS = ("postgresql", "sqlite")
+
+# Word characters only: FTS5 treats quotes, parentheses, ``*``, ``:`` and the
+# bare words AND/OR/NOT/NEAR as query syntax.
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+_tasks_fts = table("tasks_fts", column("rowid"))
+
+
+class SearchUnavailable(Exception):
+    """The configured database has no full-text search backend."""
+
+
+def search_backend(url: Optional[str] = None) -> str:
+    """Name of the search backend for ``url`` (default: ``DATABASE_URL``)."""
+    url = url or get_settings().DATABASE_URL
+    backend = make_url(url).get_backend_name()
+    if backend not in SUPPORTED_BACKENDS:
+        raise SearchUnavailable(f"No full-text search for {backend!r}")
+    return backend
+
+
+def fts5_query(text: str) -> Optional[str]:
+    """
+    Turn free text into an FTS5 query matching every word.
+
+    Each word is quoted so user input can never be parsed as FTS5 syntax;
+    returns None when ``text`` contains no searchable word.
+    """
+    tokens = _TOKEN.findall(text)
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"' for token in tokens)
+
+
+def _postgres_statement(columns, text: str):
+    vector = models.task_search_vector()
+    query = func.websearch_to_tsquery(models.TASK_SEARCH_CONFIG, text)
+    rank = func.ts_rank_cd(vector, query)
+    return (
+        select(*columns, rank.label("rank"))
+        .where(vector.op("@@")(query))
+        .order_by(rank.desc(), models.Task.id)
+    )
+
+
+def _sqlite_statement(columns, text: str):
+    match = fts5_query(text)
+    if match is None:
+        return None
+    # bm25() is lower-is-better; negate it so both backends rank alike.
+    rank = -func.bm25(literal_column("tasks_fts"))
+    return (
+        select(*columns, rank.label("rank"))
+        .select_from(
+            _tasks_fts.join(models.Task, models.Task.id == _tasks_fts.c.rowid)
+        )
+        .where(literal_column("tasks_fts").op("MATCH")(match))
+        .order_by(rank.desc(), models.Task.id)
+    )
+
+
+def search_statement(columns, text: str, backend: Optional[str] = None):
+    """
+    Ranked SELECT of ``columns`` for tasks matching ``text``.
+
+    Returns None when ``text`` has nothing to search for. Filters, limit and
+    offset are left to the caller.
+    """
+    backend = backend or search_backend()
+    if backend == "postgresql":
+        if not _TOKEN.search(text):
+            return None
+        return _postgres_statement(columns, text)
+    return _sqlite_statement(columns, text)
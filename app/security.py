@@ -1,21 +1,97 @@
-from passlib.context import CryptContext
+import asyncio
+import hashlib
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from jose import jwt, JWTError
 from datetime import datetime, timedelta
 from typing import Optional
 
 from config import get_settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+_pwd_context = None
+
+
+def get_pwd_context():
+    """
+    The bcrypt CryptContext, built on first use.
+
+    passlib and bcrypt are only imported when a password is actually hashed
+    or verified, keeping them off the import path of a booting worker.
+    """
+    global _pwd_context
+    if _pwd_context is None:
+        from passlib.context import CryptContext
+
+        _pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    return _pwd_context
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when too many hash/verify calls are already waiting."""
 
 
 def hash_password(password: str) -> str:
     """Hash a plain password."""
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against a hashed password."""
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
+
+
+_hash_executor: Optional[Executor] = None
+_hash_pending = 0
+
+
+def _get_hash_executor() -> Executor:
+    global _hash_executor
+    if _hash_executor is None:
+        settings = get_settings()
+        executor_cls = (
+            ProcessPoolExecutor
+            if settings.PASSWORD_HASH_EXECUTOR == "process"
+            else ThreadPoolExecutor
+        )
+        _hash_executor = executor_cls(max_workers=settings.PASSWORD_HASH_WORKERS)
+    return _hash_executor
+
+
+async def _run_hasher(func, *args):
+    """
+    Run a bcrypt call off the event loop on the bounded hashing executor.
+
+    At most ``PASSWORD_HASH_MAX_PENDING`` calls may be running or queued at
+    once; beyond that PasswordHasherBusy is raised instead of letting the
+    backlog grow. With ``PASSWORD_HASH_WORKERS=0`` the call runs inline.
+    """
+    global _hash_pending
+    settings = get_settings()
+    if settings.PASSWORD_HASH_WORKERS <= 0:
+        return func(*args)
+    if _hash_pending >= settings.PASSWORD_HASH_MAX_PENDING:
+        raise PasswordHasherBusy()
+    _hash_pending += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_hash_executor(), func, *args)
+    finally:
+        _hash_pending -= 1
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash a plain password without blocking the event loop."""
+    return await _run_hasher(hash_password, password)
+
+
+async def verify_password_async(
+    plain_password: str, hashed_password: str
+) -> bool:
+    """Verify a password without blocking the event loop."""
+    return await _run_hasher(verify_password, plain_password, hashed_password)
 
 
 def create_access_token(
@@ -28,7 +104,8 @@ def create_access_token(
     expire = datetime.utcnow() + (
         expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     )
-    to_encode.update({"exp": expire})
+    # jti identifies the token for revocation (see auth.revocation).
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
     token = jwt.encode(
         to_encode,
         settings.SECRET_KEY,
@@ -37,8 +114,67 @@ def create_access_token(
     return token
 
 
+class VerifiedTokenCache:
+    """
+    Bounded LRU of already-verified tokens, keyed by a SHA-256 of the token.
+
+    A token's signature and claims never change, so once verified it stays
+    valid until its ``exp``; entries expire at that moment.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token: str) -> Optional[dict]:
+        key = self.key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, payload = entry
+                if expires_at > time.time():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return payload
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def set(self, token: str, payload: dict) -> None:
+        expires_at = payload.get("exp")
+        if not isinstance(expires_at, (int, float)) or self.max_size <= 0:
+            return
+        key = self.key(token)
+        with self._lock:
+            self._entries[key] = (expires_at, payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def discard(self, token: str) -> None:
+        with self._lock:
+            self._entries.pop(self.key(token), None)
+
+    def stats(self) -> dict:
+        return {"size": len(self._entries), "hits": self.hits,
+                "misses": self.misses}
+
+
+verified_tokens = VerifiedTokenCache(get_settings().TOKEN_CACHE_MAX_SIZE)
+
+
 def decode_access_token(token: str) -> Optional[dict]:
     """Decode and validate a JWT token. Returns payload or None if invalid."""
+    cached = verified_tokens.get(token)
+    if cached is not None:
+        return cached
     settings = get_settings()
     try:
         decoded = jwt.decode(
@@ -48,7 +184,8 @@ def decode_access_token(token: str) -> Optional[dict]:
                 settings.ALGORITHM,
             ],
         )
-        return decoded
     except JWTError:
         return None
+    verified_tokens.set(token, decoded)
+    return decoded
 
@@ -0,0 +1,172 @@
+"""
+Incrementally maintained per-project task counters.
+
+Every task write records its effect on the ``project_task_counts`` table in
+the same transaction, so ``GET /projects/{id}/stats`` reads at most
+``len(TaskStatus) * len(TaskPriority)`` rows instead of grouping ``tasks``.
+
+Drift (e.g. rows changed by hand) can be detected and repaired with::
+
+    python -m task_stats verify [--project-id N]
+    python -m task_stats rebuild [--project-id N]
+"""
+import argparse
+import asyncio
+from collections import Counter
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import delete, func, insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from models import ProjectTaskCount, Task, TaskPriority, TaskStatus
+
+Key = Tuple[int, TaskStatus, TaskPriority]
+
+
+def _sort_key(key: Key) -> tuple:
+    project_id, status, priority = key
+    return project_id, status.value, priority.value
+
+
+class TaskCountDeltas(Counter):
+    """Pending counter changes keyed by (project_id, status, priority)."""
+
+    def add(self, project_id: int, status, priority, amount: int = 1) -> None:
+        key = (
+            project_id,
+            TaskStatus(status or TaskStatus.todo),
+            TaskPriority(priority or TaskPriority.medium),
+        )
+        self[key] += amount
+
+    def move(self, old: Iterable, new: Iterable) -> None:
+        """Record a task moving from ``old`` to ``new`` (project, status, priority)."""
+        self.add(*old, amount=-1)
+        self.add(*new, amount=1)
+
+
+def _upsert(dialect_name: str):
+    if dialect_name == "postgresql":
+        return postgresql.insert(ProjectTaskCount)
+    if dialect_name == "sqlite":
+        return sqlite.insert(ProjectTaskCount)
+    raise NotImplementedError(f"Task counters need an upsert for {dialect_name}")
+
+
+async def apply_deltas(session: AsyncSession, deltas: TaskCountDeltas) -> None:
+    """Add ``deltas`` to the counters within the session's transaction."""
+    rows = [
+        {"project_id": project_id, "status": status, "priority": priority,
+         "count": amount}
+        # Sorted so concurrent writers lock counter rows in the same order.
+        for (project_id, status, priority), amount in sorted(
+            deltas.items(), key=lambda item: _sort_key(item[0])
+        )
+        if amount
+    ]
+    if not rows:
+        return
+    stmt = _upsert(session.get_bind().dialect.name)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["project_id", "status", "priority"],
+        set_={"count": ProjectTaskCount.count + stmt.excluded.count},
+    )
+    await session.execute(stmt, rows)
+
+
+async def project_stats(session: AsyncSession, project_id: int) -> dict:
+    result = await session.execute(
+        select(
+            ProjectTaskCount.status,
+            ProjectTaskCount.priority,
+            ProjectTaskCount.count,
+        ).where(ProjectTaskCount.project_id == project_id)
+    )
+    by_status = {status.value: 0 for status in TaskStatus}
+    by_priority = {priority.value: 0 for priority in TaskPriority}
+    for status, priority, count in result.all():
+        by_status[status.value] += count
+        by_priority[priority.value] += count
+    return {
+        "project_id": project_id,
+        "total": sum(by_status.values()),
+        "by_status": by_status,
+        "by_priority": by_priority,
+    }
+
+
+async def _counts(session: AsyncSession, source, project_id: Optional[int]) -> Dict[Key, int]:
+    if source is Task:
+        query = select(
+            Task.project_id, Task.status, Task.priority, func.count()
+        ).group_by(Task.project_id, Task.status, Task.priority)
+    else:
+        query = select(
+            ProjectTaskCount.project_id,
+            ProjectTaskCount.status,
+            ProjectTaskCount.priority,
+            ProjectTaskCount.count,
+        )
+    if project_id is not None:
+        query = query.where(source.project_id == project_id)
+    result = await session.execute(query)
+    return {
+        (row[0], row[1], row[2]): row[3] for row in result.all() if row[3]
+    }
+
+
+async def verify(session: AsyncSession, project_id: int = None) -> Dict[Key, tuple]:
+    """Return {key: (stored, actual)} for every counter that drifted."""
+    stored = await _counts(session, ProjectTaskCount, project_id)
+    actual = await _counts(session, Task, project_id)
+    return {
+        key: (stored.get(key, 0), actual.get(key, 0))
+        for key in stored.keys() | actual.keys()
+        if stored.get(key, 0) != actual.get(key, 0)
+    }
+
+
+async def rebuild(session: AsyncSession, project_id: int = None) -> None:
+    """Recompute counters from ``tasks`` (set-based) and commit."""
+    clear = delete(ProjectTaskCount)
+    source = select(
+        Task.project_id, Task.status, Task.priority, func.count()
+    ).group_by(Task.project_id, Task.status, Task.priority)
+    if project_id is not None:
+        clear = clear.where(ProjectTaskCount.project_id == project_id)
+        source = source.where(Task.project_id == project_id)
+    await session.execute(clear)
+    await session.execute(
+        insert(ProjectTaskCount).from_select(
+            ["project_id", "status", "priority", "count"], source
+        )
+    )
+    await session.commit()
+
+
+async def _main(command: str, project_id: Optional[int]) -> int:
+    from database import async_session_factory
+
+    async with async_session_factory() as session:
+        if command == "rebuild":
+            await rebuild(session, project_id)
+            print("Task counters rebuilt")
+            return 0
+        drift = await verify(session, project_id)
+    for (pid, status, priority), (stored, actual) in sorted(
+        drift.items(), key=lambda item: _sort_key(item[0])
+    ):
+        print(f"project {pid} {status.value}/{priority.value}: "
+              f"stored={stored} actual={actual}")
+    print(f"{len(drift)} drifted counters")
+    return 1 if drift else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Verify or rebuild task counters")
+    parser.add_argument("command", choices=["verify", "rebuild"])
+    parser.add_argument("--project-id", type=int)
+    args = parser.parse_args()
+    raise SystemExit(asyncio.run(_main(args.command, args.project_id)))
@@ -0,0 +1,19 @@
+"""
+Test configuration: run the app against a throwaway SQLite database.
+
+Settings are read when the app modules are imported, so the environment is
+set here, before any test module imports them.
+"""
+import os
+import sys
+import tempfile
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+_db_dir = tempfile.mkdtemp(prefix="tms-tests-")
+os.environ["DATABASE_URL"] = (
+    f"sqlite+aiosqlite:///{os.path.join(_db_dir, 'test.db')}"
+)
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+os.environ.setdefault("EVENTS_ENABLED", "false")
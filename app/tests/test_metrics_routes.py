@@ -0,0 +1,36 @@
+"""Request metrics are labelled by the full route template, prefix included."""
+import asyncio
+
+from benchmarks import _app
+from database import engine
+from metrics import REQUESTS
+
+
+def _route_labels() -> set:
+    index = REQUESTS.label_names.index("route")
+    return {key[index] for key in REQUESTS.values}
+
+
+async def _requests() -> None:
+    try:
+        async with _app.app_client() as client:
+            token = await _app.register_and_login(
+                client, "metrics@example.com", "metrics-password"
+            )
+            headers = {"Authorization": f"Bearer {token}"}
+            await client.get("/projects/0", headers=headers)
+            await client.get("/tasks/tasks/0", headers=headers)
+            await client.get("/no/such/path")
+    finally:
+        await engine.dispose()
+
+
+def test_route_label_includes_router_prefix():
+    asyncio.run(_requests())
+    labels = _route_labels()
+    assert "/projects/{project_id}" in labels
+    assert "/tasks/tasks/{task_id}" in labels
+    assert "/auth/login" in labels
+    assert "unmatched" in labels
+    assert "/{project_id}" not in labels
+    assert "/tasks/{task_id}" not in labels
@@ -0,0 +1,96 @@
+"""GET /projects/{id}/board runs a fixed number of queries, however big the page."""
+import asyncio
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event, select
+
+from benchmarks import _app
+from database import async_session_factory, engine
+from models import User
+
+BOARD_QUERIES = 3  # project, page of tasks, assignees (selectinload IN)
+ASSIGNEES = 4
+PASSWORD = "board-password"
+
+
+@contextmanager
+def count_queries():
+    """Count the statements sent to the database inside the block."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(
+            engine.sync_engine, "before_cursor_execute", before_cursor_execute
+        )
+
+
+async def _board_queries(task_count: int, limit: int) -> list:
+    """Seed a project with ``task_count`` tasks and count one board request."""
+    try:
+        async with _app.app_client() as client:
+            token = await _app.register_and_login(
+                client, "owner@example.com", PASSWORD
+            )
+            headers = {"Authorization": f"Bearer {token}"}
+            for i in range(ASSIGNEES):
+                await _app.register_and_login(
+                    client, f"assignee{i}@example.com", PASSWORD
+                )
+            async with async_session_factory() as session:
+                result = await session.execute(
+                    select(User.id).where(User.email.like("assignee%"))
+                )
+                assignee_ids = sorted(result.scalars().all())
+
+            response = await client.post(
+                "/projects/", json={"name": f"board {task_count}"}, headers=headers
+            )
+            response.raise_for_status()
+            project_id = response.json()["id"]
+            response = await client.post(
+                "/tasks/tasks/bulk",
+                json=[
+                    {
+                        "title": f"task {i}",
+                        "project_id": project_id,
+                        # Every fifth task is unassigned.
+                        "assignee_id": (
+                            None if i % 5 == 4
+                            else assignee_ids[i % len(assignee_ids)]
+                        ),
+                    }
+                    for i in range(task_count)
+                ],
+                headers=headers,
+            )
+            response.raise_for_status()
+            assert all(item["ok"] for item in response.json())
+
+            url = f"/projects/{project_id}/board?limit={limit}"
+            # Warm the per-process caches (current user) outside the count.
+            (await client.get(url, headers=headers)).raise_for_status()
+            with count_queries() as statements:
+                response = await client.get(url, headers=headers)
+            response.raise_for_status()
+            board = response.json()
+            assert len(board["tasks"]) == min(task_count, limit)
+            assert len(board["assignees"]) == min(ASSIGNEES, len(board["tasks"]))
+            return statements
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.parametrize(
+    "task_count, limit",
+    [(1, 50), (10, 50), (200, 200), (300, 50)],
+)
+def test_board_query_count_is_constant(task_count, limit):
+    statements = asyncio.run(_board_queries(task_count, limit))
+    assert len(statements) == BOARD_QUERIES, statements
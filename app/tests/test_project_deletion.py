@@ -0,0 +1,74 @@
+"""Batched project deletion keeps project_task_counts in step after every batch."""
+import asyncio
+
+import pytest
+
+import task_stats
+from benchmarks import _app
+from database import async_session_factory, engine
+from project_deletion import count_tasks, delete_project_in_batches
+
+TASKS = 30
+BATCH_SIZE = 7
+STATUSES = ("todo", "in_progress", "done")
+PRIORITIES = ("low", "medium", "high")
+
+
+class Interrupted(Exception):
+    pass
+
+
+async def _seed_project() -> int:
+    async with _app.app_client() as client:
+        token = await _app.register_and_login(
+            client, "deletion@example.com", "deletion-password"
+        )
+        headers = {"Authorization": f"Bearer {token}"}
+        response = await client.post(
+            "/projects/", json={"name": "batched deletion"}, headers=headers
+        )
+        response.raise_for_status()
+        project_id = response.json()["id"]
+        response = await client.post(
+            "/tasks/tasks/bulk",
+            json=[
+                {
+                    "title": f"task {i}",
+                    "project_id": project_id,
+                    "status": STATUSES[i % len(STATUSES)],
+                    "priority": PRIORITIES[i % len(PRIORITIES)],
+                }
+                for i in range(TASKS)
+            ],
+            headers=headers,
+        )
+        response.raise_for_status()
+        assert all(item["ok"] for item in response.json())
+        return project_id
+
+
+async def _interrupted_deletion() -> tuple:
+    """Stop a deletion after two batches; return (remaining, drift)."""
+    try:
+        project_id = await _seed_project()
+
+        def on_progress(deleted, total):
+            if deleted >= 2 * BATCH_SIZE:
+                raise Interrupted
+
+        with pytest.raises(Interrupted):
+            await delete_project_in_batches(
+                project_id, batch_size=BATCH_SIZE, on_progress=on_progress
+            )
+        async with async_session_factory() as session:
+            remaining = await count_tasks(session, project_id)
+            drift = await task_stats.verify(session, project_id)
+        return remaining, drift
+    finally:
+        await engine.dispose()
+
+
+def test_counters_match_tasks_between_batches():
+    remaining, drift = asyncio.run(_interrupted_deletion())
+    assert remaining == TASKS - 2 * BATCH_SIZE
+    assert drift == {}